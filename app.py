@@ -10,30 +10,71 @@ import os
 import logging
 import threading
 import time
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Fast JSON encoding for the polled /api endpoints (optional - falls back to Flask's encoder)
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging with in-memory buffer
 class LogBuffer(logging.Handler):
     """Store recent logs in memory for dashboard display"""
     def __init__(self, max_lines=100):
         super().__init__()
-        self.logs = []
+        self.logs = deque(maxlen=max_lines)  # (seq, line) ring buffer - oldest lines drop off automatically
         self.max_lines = max_lines
+        self._seq = 0  # Monotonic line counter, used as the SSE event id
+        # Agent thread writes while Flask request threads read / wait for new lines
+        self._cond = threading.Condition()
+
+    @property
+    def latest_seq(self):
+        return self._seq
 
     def emit(self, record):
         msg = self.format(record)
-        self.logs.append(msg)
-        if len(self.logs) > self.max_lines:
-            self.logs = self.logs[-self.max_lines:]
+        with self._cond:
+            self._seq += 1
+            self.logs.append((self._seq, msg))
+            self._cond.notify_all()
 
     def get_logs(self):
-        return self.logs.copy()
+        with self._cond:
+            return [msg for _, msg in self.logs]
+
+    def get_since(self, seq):
+        """Return (seq, line) pairs logged after seq"""
+        with self._cond:
+            return [entry for entry in self.logs if entry[0] > seq]
+
+    def wait_for_new(self, seq, timeout):
+        """Block until a line newer than seq is logged; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq > seq, timeout=timeout)
 
     def clear(self):
-        self.logs = []
+        with self._cond:
+            self.logs.clear()
 
 log_buffer = LogBuffer()
 log_buffer.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
@@ -48,6 +89,8 @@ logger.addHandler(log_buffer)
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv("FLASK_SECRET_KEY", "default-dev-key")
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 
 # Basic Auth
 ADMIN_USER = os.getenv("ADMIN_USER", "admin")
@@ -79,6 +122,7 @@ from src.market.polymarket import fetch_active_markets
 from src.analysis.ai_analyzer import get_analyzer
 from src.trading.wallet import get_wallet
 from src.trading.executor import get_executor
+from src.signals.trades import get_smart_money_summaries, create_client
 
 # Initialize BlockRun client and trading
 analyzer = get_analyzer()
@@ -104,14 +148,64 @@ else:
     logger.warning("Trade executor not available")
 
 
+# ============ Market Cache ============
+# Dashboard pageviews and XHR polls all want the same market list, so
+# serve them from a short-lived cache instead of hitting Polymarket each time
+MARKETS_CACHE_TTL = 20  # seconds
+# Smaller requests are served by slicing this list (results are volume-sorted),
+# so the dashboard, /api/markets and the agent share one cache entry
+MARKETS_CACHE_LIMIT = 20
+_markets_cache = {}  # limit -> (fetched_at, markets)
+_markets_cache_lock = threading.Lock()
+_markets_fetch_locks = {}  # limit -> Lock held by the one in-flight fetch
+
+
+def _fresh_cached_markets(limit: int):
+    """Return cached markets for limit if still fresh, else None"""
+    with _markets_cache_lock:
+        cached = _markets_cache.get(limit)
+    if cached and time.monotonic() - cached[0] < MARKETS_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def get_cached_markets(limit: int = 20):
+    """Fetch active markets, reusing a result younger than MARKETS_CACHE_TTL"""
+    return _get_cached_markets(max(limit, MARKETS_CACHE_LIMIT))[:limit]
+
+
+def _get_cached_markets(limit: int):
+    markets = _fresh_cached_markets(limit)
+    if markets is not None:
+        return markets
+
+    # Single-flight: only one thread fetches per limit, the rest wait for its result
+    with _markets_cache_lock:
+        fetch_lock = _markets_fetch_locks.setdefault(limit, threading.Lock())
+
+    with fetch_lock:
+        markets = _fresh_cached_markets(limit)
+        if markets is not None:
+            return markets
+
+        markets = fetch_active_markets(limit=limit)
+        if markets:  # Don't cache failed/empty fetches
+            with _markets_cache_lock:
+                _markets_cache[limit] = (time.monotonic(), markets)
+        return markets
+
+
 # ============ Agent State ============
+MAX_DECISIONS = 30  # Recent AI decisions kept in memory / storage
+
+
 class AgentState:
     def __init__(self):
         self.running = False
         self.thread = None
         self.last_run = None
         self.cycle_count = 0
-        self.decisions = []
+        self.decisions = deque(maxlen=MAX_DECISIONS)
         self.trades = []
         self.error = None
         self.auto_trade = False  # Auto-trading disabled by default
@@ -132,18 +226,22 @@ class AgentState:
                 self._load_from_tmp()
                 return
 
-            # Load from GCS
-            self.trades = storage.load_orders()
+            # Load from GCS - both blobs in parallel (one round trip instead of two)
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                orders_future = pool.submit(storage.load_orders)
+                decisions_future = pool.submit(storage.load_decisions)
+
+            self.trades = orders_future.result()
             logger.info(f"📦 Loaded {len(self.trades)} orders from GCS")
 
-            self.decisions = storage.load_decisions()
+            self.decisions = deque(decisions_future.result(), maxlen=MAX_DECISIONS)
             logger.info(f"🧠 Loaded {len(self.decisions)} decisions from GCS")
 
         except Exception as e:
             logger.error(f"Failed to load from GCS: {e}")
             logger.warning("Continuing with empty state")
             self.trades = []
-            self.decisions = []
+            self.decisions = deque(maxlen=MAX_DECISIONS)
 
     def _load_from_tmp(self):
         """Load data from local /tmp directory (fallback when GCS disabled)"""
@@ -171,13 +269,13 @@ class AgentState:
             if os.path.exists(tmp_decisions):
                 with open(tmp_decisions, 'r') as f:
                     data = json.load(f)
-                    self.decisions = data.get('decisions', [])
+                    self.decisions = deque(data.get('decisions', []), maxlen=MAX_DECISIONS)
                     logger.info(f"🧠 Loaded {len(self.decisions)} decisions from /tmp")
             else:
-                self.decisions = []
+                self.decisions = deque(maxlen=MAX_DECISIONS)
         except Exception as e:
             logger.error(f"Failed to load decisions from /tmp: {e}")
-            self.decisions = []
+            self.decisions = deque(maxlen=MAX_DECISIONS)
 
     def save_persistent_data(self):
         """
@@ -193,9 +291,10 @@ class AgentState:
                 self._save_to_tmp()
                 return
 
-            # Save to GCS
-            storage.save_orders(self.trades)
-            storage.save_decisions(self.decisions)
+            # Save to GCS - uploads are independent, run them in parallel
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                pool.submit(storage.save_orders, list(self.trades))
+                pool.submit(storage.save_decisions, list(self.decisions))
 
             logger.info(f"💾 Saved {len(self.trades)} orders and {len(self.decisions)} decisions to GCS")
 
@@ -226,7 +325,7 @@ class AgentState:
         # Save decisions
         try:
             decisions_data = {
-                'decisions': self.decisions,
+                'decisions': list(self.decisions),
                 'updated_at': datetime.now().isoformat(),
                 'total_decisions': len(self.decisions)
             }
@@ -237,6 +336,68 @@ class AgentState:
 
         logger.info(f"💾 Saved {len(self.trades)} orders and {len(self.decisions)} decisions to /tmp")
 
+    def add_tracked_order(self, data):
+        """
+        Record an externally placed order in the tracked history and persist it
+
+        In-process callers can use this directly instead of POSTing to /api/add_order.
+
+        Args:
+            data: Order fields (order_id required; market, action, size, status, ...)
+
+        Returns:
+            The normalized order dict that was stored
+        """
+        order = self._tracked_order(data)
+
+        self.trades.append(order)
+        self.save_persistent_trades()
+
+        logger.info(f"📝 Manually added order: {order['order_id'][:20]}... for {order['market']}")
+        return order
+
+    def add_tracked_orders(self, items):
+        """
+        Record several externally placed orders, persisting once for the whole batch
+
+        Args:
+            items: List of order field dicts (same shape as add_tracked_order)
+
+        Returns:
+            Per-item results: {"status": "success", "order": ...} or {"status": "error", "error": ...}
+        """
+        results = []
+        added = 0
+        for data in items:
+            try:
+                order = self._tracked_order(data)
+            except Exception as e:
+                results.append({"status": "error", "error": str(e)})
+                continue
+            self.trades.append(order)
+            added += 1
+            results.append({"status": "success", "order": order})
+
+        if added:
+            self.save_persistent_trades()
+            logger.info(f"📝 Manually added {added} orders")
+        return results
+
+    @staticmethod
+    def _tracked_order(data):
+        """Normalize externally supplied order fields for the tracked history"""
+        if not data.get("order_id"):
+            raise ValueError("order_id is required")
+        return {
+            "timestamp": data.get("timestamp", datetime.now().isoformat()),
+            "market": data.get("market", "Unknown"),
+            "action": data.get("action", "Unknown"),
+            "size": float(data.get("size", 0)),
+            "order_id": data.get("order_id"),
+            "status": data.get("status", "submitted"),
+            "message": data.get("message", "Manually added order")
+        }
+
     # Backward compatibility aliases
     def save_persistent_trades(self):
         """Alias for backward compatibility"""
@@ -244,15 +405,61 @@ class AgentState:
 
 state = AgentState()
 
+# Consensus analyses are blocking LLM calls - markets x models share one pool
+# (in-flight calls are further capped by MAX_CONCURRENT_LLM_CALLS in ai_analyzer)
+CONSENSUS_WORKERS = 15
+
+# Reuse a market's consensus analysis while its odds and whale flow haven't moved,
+# so repeated runs don't pay for the same LLM calls again
+ANALYSIS_CACHE_TTL = 60 * 60  # 1 hour
+ANALYSIS_CACHE_MAX = 256
+_analysis_cache = {}  # (market_id, rounded yes_odds, whale signature) -> (analyzed_at, analysis)
+
+
+def _analysis_cache_key(market_id, yes_odds, whale_data):
+    # Whale data goes into the consensus prompt, so a shift in smart money flow needs a fresh analysis
+    whale_signature = None
+    if whale_data:
+        whale_signature = (
+            whale_data.get("has_smart_money_activity"),
+            whale_data.get("consensus"),
+            whale_data.get("smart_money_direction"),
+        )
+    return (market_id, round(float(yes_odds or 0), 3), whale_signature)
+
+
+def _get_cached_analysis(key):
+    """Return a cached consensus analysis if still fresh, else None"""
+    cached = _analysis_cache.get(key)
+    if cached and time.monotonic() - cached[0] < ANALYSIS_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _cache_analysis(key, analysis):
+    """Remember a successful analysis, evicting the oldest entry when full"""
+    if analysis.get("consensus") == "ERROR":
+        return
+    _analysis_cache.pop(key, None)
+    if len(_analysis_cache) >= ANALYSIS_CACHE_MAX:
+        _analysis_cache.pop(next(iter(_analysis_cache)))
+    _analysis_cache[key] = (time.monotonic(), analysis)
 
-def run_agent_cycle():
-    """Run one cycle of market analysis with multi-model consensus"""
+
+def run_agent_cycle(whale_loop=None, whale_client=None):
+    """
+    Run one cycle of market analysis with multi-model consensus
+
+    Args:
+        whale_loop: Long-lived event loop to run whale lookups on (one is created if omitted)
+        whale_client: Shared rate-limited client (create_client) bound to whale_loop
+    """
     try:
         state.cycle_count += 1
         state.last_run = datetime.now()
         state.error = None
 
-        markets = fetch_active_markets(limit=20)
+        markets = get_cached_markets(limit=20)
         if not markets:
             logger.warning("No markets fetched from Polymarket API")
             return
@@ -262,36 +469,78 @@ def run_agent_cycle():
             return
 
         num_to_analyze = min(10, len(markets))
-        logger.info(f"Fetched {len(markets)} markets, analyzing {num_to_analyze} with 3-model consensus...")
+        logger.info("Fetched %d markets, analyzing %d with 3-model consensus...", len(markets), num_to_analyze)
 
-        # Analyze markets using multi-model consensus
-        for i, market in enumerate(markets[:num_to_analyze]):
-            logger.info(f"Analyzing market {i+1}/{num_to_analyze}...")
+        markets_to_analyze = markets[:num_to_analyze]
+        # Use condition_id for trade API (more reliable)
+        market_ids = [m.get("condition_id", m.get("id", "")) for m in markets_to_analyze]
+
+        # Get whale/smart money data for all markets concurrently from real Polymarket API
+        # Manual runs have no agent thread loop, so use a throwaway one
+        owns_loop = whale_loop is None
+        if owns_loop:
+            whale_loop = asyncio.new_event_loop()
+            whale_client = create_client()
+
+        whale_summaries = [None] * num_to_analyze
+        try:
+            whale_summaries = whale_loop.run_until_complete(
+                get_smart_money_summaries(market_ids, client=whale_client)
+            )
+        except Exception as e:
+            logger.debug("Whale data unavailable: %s", e)
+        finally:
+            if owns_loop:
+                whale_loop.run_until_complete(whale_client.aclose())
+                whale_loop.close()
+
+        # Analyze markets using multi-model consensus (fanned out across a thread pool),
+        # skipping markets whose odds are unchanged since a recent analysis
+        analysis_keys = [
+            _analysis_cache_key(market_ids[i], m.get("yes_odds", 0.5), whale_summaries[i])
+            for i, m in enumerate(markets_to_analyze)
+        ]
+        cached_analyses = [_get_cached_analysis(key) for key in analysis_keys]
+
+        uncached = [i for i in range(num_to_analyze) if cached_analyses[i] is None]
+        logger.info(
+            "Running consensus analysis on %d markets (%d reused from cache)...",
+            len(uncached), num_to_analyze - len(uncached)
+        )
+        fresh_analyses = dict(zip(uncached, analyzer.analyze_markets_consensus(
+            [
+                {
+                    "question": markets_to_analyze[i].get("question", ""),
+                    "current_odds": markets_to_analyze[i].get("yes_odds", 0.5),
+                    "whale_data": whale_summaries[i],
+                }
+                for i in uncached
+            ],
+            max_workers=CONSENSUS_WORKERS
+        )))
+
+        # State updates stay serial, in market order
+        market_records = []
+        pending_trades = []  # (decision, question, signal) for one batched order submission
+        for i, market in enumerate(markets_to_analyze):
+            logger.info("Processing market %d/%d...", i + 1, num_to_analyze)
             try:
                 question = market.get("question", "")
                 yes_odds = market.get("yes_odds", 0.5)
-                # Use condition_id for trade API (more reliable)
-                market_id = market.get("condition_id", market.get("id", ""))
-
-                # Get whale/smart money data from real Polymarket API
-                whale_data = None
-                try:
-                    import asyncio
-                    from src.signals.trades import get_smart_money_summary
-                    whale_data = asyncio.get_event_loop().run_until_complete(
-                        get_smart_money_summary(market_id)
-                    )
-                    if whale_data and whale_data.get("has_smart_money_activity"):
-                        logger.info(f"Whale signal: {whale_data.get('consensus')} ({whale_data.get('confidence', 0)*100:.0f}% confidence)")
-                except Exception as e:
-                    logger.debug(f"Whale data unavailable: {e}")
-
-                # Use 3-model consensus analysis
-                analysis = analyzer.consensus_analysis(
-                    question=question,
-                    current_odds=yes_odds,
-                    whale_data=whale_data
-                )
+                market_id = market_ids[i]
+
+                whale_data = whale_summaries[i]
+                if whale_data and whale_data.get("has_smart_money_activity"):
+                    logger.info("Whale signal: %s (%.0f%% confidence)",
+                                whale_data.get('consensus'), whale_data.get('confidence', 0) * 100)
+
+                # 3-model consensus analysis result
+                if i in fresh_analyses:
+                    analysis = fresh_analyses[i]
+                    _cache_analysis(analysis_keys[i], analysis)
+                else:
+                    analysis = cached_analyses[i]
+                    logger.info("Odds unchanged since last analysis, reusing consensus")
 
                 action = analysis.get("recommendation", "SKIP")
                 edge = analysis.get("avg_edge", 0)
@@ -324,7 +573,7 @@ def run_agent_cycle():
                 token_ids = market.get("token_ids", [])
                 yes_token = token_ids[0] if len(token_ids) > 0 else None
                 no_token = token_ids[1] if len(token_ids) > 1 else None
-                logger.info(f"Token IDs: {token_ids[:2] if token_ids else 'NONE'}")
+                logger.info("Token IDs: %s", token_ids[:2] if token_ids else 'NONE')
 
                 decision = {
                     "timestamp": datetime.now().isoformat(),
@@ -344,49 +593,21 @@ def run_agent_cycle():
                 }
 
                 # Auto-trade if enabled (only when action is BET YES or BET NO)
+                # Signals are collected here and submitted together after the loop
                 if state.auto_trade and executor and action.startswith("BET"):
-                    try:
-                        # Determine which token to trade
-                        token_id = yes_token if "YES" in action else no_token
-
-                        if token_id:
-                            confidence = analysis.get("avg_confidence", 0)
-                            bankroll = wallet.get_usdc_balance() if wallet else 100
-
-                            trade_result = executor.execute_signal(
-                                token_id=token_id,
-                                action=action,
-                                edge=edge,
-                                confidence=confidence,
-                                consensus=consensus,
-                                bankroll=bankroll
-                            )
-
-                            decision["trade_result"] = trade_result
-
-                            if trade_result.get("status") in ["success", "submitted"]:
-                                status_msg = "SUBMITTED" if trade_result.get("status") == "submitted" else "EXECUTED"
-                                logger.info(f"TRADE {status_msg}: {action} ${trade_result.get('size', 0):.2f}")
-                                logger.info(f"  Order ID: {trade_result.get('order_id', 'Unknown')}")
-                                logger.info(f"  ⚠️  Check Polymarket.com to see if order fills")
-                                state.trades.append({
-                                    "timestamp": datetime.now().isoformat(),
-                                    "market": question[:40],
-                                    "action": action,
-                                    "size": trade_result.get("size", 0),
-                                    "order_id": trade_result.get("order_id"),
-                                    "status": trade_result.get("status", "submitted"),
-                                    "message": trade_result.get("message", "")
-                                })
-                                # Persist to disk so it survives restarts
-                                state.save_persistent_trades()
-                            else:
-                                logger.info(f"Trade skipped: {trade_result.get('reason', 'unknown')}")
-                        else:
-                            logger.warning("No token ID available for trading")
-                    except Exception as e:
-                        logger.error(f"Trade execution error: {e}")
-                        decision["trade_result"] = {"status": "error", "reason": str(e)}
+                    # Determine which token to trade
+                    token_id = yes_token if "YES" in action else no_token
+
+                    if token_id:
+                        pending_trades.append((decision, question, {
+                            "token_id": token_id,
+                            "action": action,
+                            "edge": edge,
+                            "confidence": analysis.get("avg_confidence", 0),
+                            "consensus": consensus,
+                        }))
+                    else:
+                        logger.warning("No token ID available for trading")
 
                 state.decisions.append(decision)
 
@@ -403,42 +624,89 @@ def run_agent_cycle():
                     "edge": edge
                 }
 
-                # Save market analysis to GCS for assessment (if GCS enabled)
-                try:
-                    from src.storage import get_storage
-                    storage = get_storage()
-                    if storage is not None:  # Only save to GCS if enabled
-                        storage.add_market_analysis(market_record)
-                except Exception as e:
-                    logger.debug(f"Failed to save market analysis: {e}")
+                market_records.append(market_record)
 
-                # Keep only last 30
-                if len(state.decisions) > 30:
-                    state.decisions = state.decisions[-30:]
+                logger.info("Consensus: %s | %s for %s... (edge: %.1f%%)", consensus, action, question[:30], edge * 100)
 
-                logger.info(f"Consensus: {consensus} | {action} for {question[:30]}... (edge: {edge*100:.1f}%)")
+            except Exception as e:
+                logger.error("Analysis error: %s", e)
 
+        # Sign and post this cycle's orders as one batch
+        if pending_trades:
+            try:
+                bankroll = wallet.get_usdc_balance() if wallet else 100
+                trade_results = executor.execute_signals(
+                    [signal for _, _, signal in pending_trades],
+                    bankroll=bankroll
+                )
+            except Exception as e:
+                logger.error("Trade execution error: %s", e)
+                trade_results = [{"status": "error", "reason": str(e)} for _ in pending_trades]
+
+            submitted = False
+            for (decision, question, signal), trade_result in zip(pending_trades, trade_results):
+                decision["trade_result"] = trade_result
+                action = signal["action"]
+
+                if trade_result.get("status") in ["success", "submitted"]:
+                    status_msg = "SUBMITTED" if trade_result.get("status") == "submitted" else "EXECUTED"
+                    logger.info("TRADE %s: %s $%.2f", status_msg, action, trade_result.get('size', 0))
+                    logger.info("  Order ID: %s", trade_result.get('order_id', 'Unknown'))
+                    logger.info("  ⚠️  Check Polymarket.com to see if order fills")
+                    state.trades.append({
+                        "timestamp": datetime.now().isoformat(),
+                        "market": question[:40],
+                        "action": action,
+                        "size": trade_result.get("size", 0),
+                        "order_id": trade_result.get("order_id"),
+                        "status": trade_result.get("status", "submitted"),
+                        "message": trade_result.get("message", "")
+                    })
+                    submitted = True
+                else:
+                    logger.info("Trade skipped: %s", trade_result.get('reason', 'unknown'))
+
+            # Persist to disk so it survives restarts
+            if submitted:
+                state.save_persistent_trades()
+
+        # Save the cycle's market analyses to GCS for assessment in one write (if GCS enabled)
+        if market_records:
+            try:
+                from src.storage import get_storage
+                storage = get_storage()
+                if storage is not None:  # Only save to GCS if enabled
+                    storage.add_market_analyses(market_records)
             except Exception as e:
-                logger.error(f"Analysis error: {e}")
+                logger.debug("Failed to save market analyses: %s", e)
 
         # Save decisions to GCS at end of cycle
         try:
             state.save_persistent_data()
         except Exception as e:
-            logger.error(f"Failed to save cycle data to GCS: {e}")
+            logger.error("Failed to save cycle data to GCS: %s", e)
 
     except Exception as e:
         state.error = str(e)
-        logger.error(f"Cycle error: {e}")
+        logger.error("Cycle error: %s", e)
 
 
 def agent_loop():
     """Background agent loop - continuous market analysis"""
-    while state.running:
-        run_agent_cycle()
-        # Wait 6 hours before next cycle (for continuous demo running)
-        logger.info("Cycle complete. Next cycle in 6 hours...")
-        time.sleep(6 * 60 * 60)  # 6 hours between cycles
+    # One event loop + whale HTTP client for the thread's lifetime, reused every cycle
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    whale_client = create_client()
+
+    try:
+        while state.running:
+            run_agent_cycle(whale_loop=loop, whale_client=whale_client)
+            # Wait 6 hours before next cycle (for continuous demo running)
+            logger.info("Cycle complete. Next cycle in 6 hours...")
+            time.sleep(6 * 60 * 60)  # 6 hours between cycles
+    finally:
+        loop.run_until_complete(whale_client.aclose())
+        loop.close()
 
 
 def start_agent():
@@ -459,49 +727,39 @@ def stop_agent():
     return True
 
 
+def _to_float(value) -> float:
+    """Coerce an API number (number, numeric string or None) to float, 0 if unparseable"""
+    # Fast path: Gamma API mostly hands back real numbers already
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
 def get_dashboard_data():
     """Get data for dashboard display"""
     # Fetch markets
-    markets = fetch_active_markets(limit=10)
+    markets = get_cached_markets(limit=10)
 
     # Format for display - keep raw numeric values for template
+    # (volume/odds may arrive as strings or numbers)
     formatted_markets = []
     for m in markets[:8]:
-        # Handle volume as string or number
-        vol = m.get('volume', 0)
-        try:
-            vol = float(vol) if vol else 0
-        except (ValueError, TypeError):
-            vol = 0
-
-        # Get odds as floats
-        yes_odds = m.get('yes_odds', 0)
-        no_odds = m.get('no_odds', 0)
-        try:
-            yes_odds = float(yes_odds) if yes_odds else 0
-        except (ValueError, TypeError):
-            yes_odds = 0
-        try:
-            no_odds = float(no_odds) if no_odds else 0
-        except (ValueError, TypeError):
-            no_odds = 0
-
         formatted_markets.append({
             "question": m.get("question", "Unknown"),
             "description": m.get("description", "")[:200],
             "end_date": m.get("end_date", "Unknown"),
-            "volume": vol,
-            "yes_odds": yes_odds,
-            "no_odds": no_odds,
+            "volume": _to_float(m.get('volume')),
+            "yes_odds": _to_float(m.get('yes_odds')),
+            "no_odds": _to_float(m.get('no_odds')),
         })
 
     # Calculate mock totals (in production, use real portfolio data)
-    def safe_float(v):
-        try:
-            return float(v) if v else 0
-        except (ValueError, TypeError):
-            return 0
-    total_bet = sum(safe_float(m.get("volume", 0)) for m in markets[:5]) / 1000
+    total_bet = sum(_to_float(m.get("volume")) for m in markets[:5]) / 1000
     expected_profit = total_bet * 0.15  # Mock 15% expected return
     roi = 15.0
 
@@ -522,17 +780,32 @@ def truncate_address(address: str) -> str:
     return f"{address[:6]}...{address[-4:]}"
 
 
+# Rendered dashboard HTML - the page only changes when the market cache does
+DASHBOARD_CACHE_TTL = MARKETS_CACHE_TTL
+_dashboard_html = {"rendered_at": 0.0, "html": None}
+
+
 @app.route('/')
 def home():
     """Dashboard home page - public for demo"""
-    data = get_dashboard_data()
-    return render_template('index.html', **data)
+    html = _dashboard_html["html"]
+    if html is None or time.monotonic() - _dashboard_html["rendered_at"] >= DASHBOARD_CACHE_TTL:
+        data = get_dashboard_data()
+        html = render_template('index.html', **data)
+        _dashboard_html.update(rendered_at=time.monotonic(), html=html)
+
+    # ETag lets repeat visitors get a 304 instead of the full page
+    response = Response(html, mimetype='text/html')
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.max_age = DASHBOARD_CACHE_TTL
+    return response.make_conditional(request)
 
 
 @app.route('/api/markets')
 def api_markets():
     """API endpoint to get market data"""
-    markets = fetch_active_markets(limit=20)
+    markets = get_cached_markets(limit=20)
     return jsonify({
         "count": len(markets),
         "markets": markets
@@ -553,8 +826,9 @@ def api_status():
 
     if wallet:
         status["trading_wallet"] = truncate_address(wallet.address)
-        status["usdc_balance"] = wallet.get_usdc_balance()
-        status["approved"] = wallet.check_approval()
+        wallet_status = wallet.get_status_bundle()
+        status["usdc_balance"] = wallet_status["usdc"]
+        status["approved"] = wallet_status["allowance"] >= 1.0
 
     return jsonify(status)
 
@@ -565,7 +839,7 @@ def api_analyze():
     if not analyzer:
         return jsonify({"error": "AI analyzer not configured"}), 503
 
-    markets = fetch_active_markets(limit=10)
+    markets = get_cached_markets(limit=10)
 
     if not markets:
         return jsonify({"error": "No markets available"}), 404
@@ -614,7 +888,7 @@ def api_agent_status():
 @app.route('/api/agent/decisions')
 def api_decisions():
     """Get recent decisions"""
-    return jsonify({"decisions": state.decisions[-20:]})
+    return jsonify({"decisions": list(state.decisions)[-20:]})
 
 
 @app.route('/api/agent/run-once', methods=['POST'])
@@ -661,8 +935,10 @@ def api_positions():
     try:
         # Fetch live data from Polymarket API
         logger.info("📊 Fetching live data from Polymarket CLOB...")
-        open_orders = executor.get_open_orders()
-        positions = executor.get_positions()
+        # One get_orders() round trip feeds both views
+        orders = executor.fetch_orders()
+        open_orders = executor.get_open_orders(orders)
+        positions = executor.get_positions(orders)
         logger.info(f"   Live orders: {len(open_orders)}, Positions: {len(positions)}")
 
         # Get tracked order history from persistent storage (all sessions)
@@ -705,33 +981,90 @@ def api_positions():
 def api_add_order():
     """Manually add an order to track (for orders placed before persistence was added)"""
     try:
-        data = request.json
-        order = {
-            "timestamp": data.get("timestamp", datetime.now().isoformat()),
-            "market": data.get("market", "Unknown"),
-            "action": data.get("action", "Unknown"),
-            "size": float(data.get("size", 0)),
-            "order_id": data.get("order_id"),
-            "status": data.get("status", "submitted"),
-            "message": data.get("message", "Manually added order")
-        }
-
-        state.trades.append(order)
-        state.save_persistent_trades()
-
-        logger.info(f"📝 Manually added order: {order['order_id'][:20]}... for {order['market']}")
+        order = state.add_tracked_order(request.json)
         return jsonify({"status": "success", "order": order})
     except Exception as e:
         logger.error(f"Failed to add order: {e}")
         return jsonify({"status": "error", "error": str(e)}), 400
 
 
+@app.route('/api/add_orders', methods=['POST'])
+def api_add_orders():
+    """Bulk version of /api/add_order: {"orders": [...]} in one request, persisted once"""
+    try:
+        orders = (request.json or {}).get("orders")
+        if not isinstance(orders, list):
+            raise ValueError("Expected a JSON body of the form {\"orders\": [...]}")
+        results = state.add_tracked_orders(orders)
+        return jsonify({
+            "status": "success",
+            "added": sum(1 for r in results if r["status"] == "success"),
+            "results": results
+        })
+    except Exception as e:
+        logger.error(f"Failed to add orders: {e}")
+        return jsonify({"status": "error", "error": str(e)}), 400
+
+
 @app.route('/api/logs')
 def api_logs():
     """Get recent logs"""
     return jsonify({"logs": log_buffer.get_logs()})
 
 
+# SSE log streaming - push new lines instead of re-sending the buffer every poll
+LOG_STREAM_KEEPALIVE = 15  # seconds between heartbeat comments
+LOG_STREAM_MAX_AGE = 300  # close after 5 min; EventSource reconnects with Last-Event-ID
+# Each open stream pins one gunicorn thread (Dockerfile runs 8) - keep the rest for API routes
+LOG_STREAM_MAX_CLIENTS = 4
+LOG_STREAM_RETRY_AFTER = 30  # seconds; busy clients fall back to polling /api/logs
+
+_log_stream_slots = threading.BoundedSemaphore(LOG_STREAM_MAX_CLIENTS)
+
+
+def _sse_event(seq, line):
+    """Format one log line as an SSE event (multi-line messages need one data: per line)"""
+    data = "".join(f"data: {part}\n" for part in line.split("\n"))
+    return f"id: {seq}\n{data}\n"
+
+
+@app.route('/api/logs/stream')
+def api_logs_stream():
+    """Stream log lines as Server-Sent Events (503 when LOG_STREAM_MAX_CLIENTS are open)"""
+    if not _log_stream_slots.acquire(blocking=False):
+        return Response(
+            "Too many log streams, poll /api/logs instead\n",
+            status=503,
+            mimetype='text/plain',
+            headers={'Retry-After': str(LOG_STREAM_RETRY_AFTER)}
+        )
+
+    since = request.headers.get('Last-Event-ID', 0, type=int)
+    if since > log_buffer.latest_seq:  # Server restarted since the client's last event
+        since = 0
+
+    def generate():
+        last = since
+        deadline = time.monotonic() + LOG_STREAM_MAX_AGE
+        while time.monotonic() < deadline:
+            entries = log_buffer.get_since(last)
+            if entries:
+                for seq, line in entries:
+                    yield _sse_event(seq, line)
+                last = entries[-1][0]
+            elif not log_buffer.wait_for_new(last, timeout=LOG_STREAM_KEEPALIVE):
+                yield ": keepalive\n\n"
+
+    response = Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Free the slot when the server closes the response (client gone or max age reached)
+    response.call_on_close(_log_stream_slots.release)
+    return response
+
+
 @app.route('/api/logs/clear', methods=['POST'])
 @requires_auth
 def api_clear_logs():
@@ -768,7 +1101,8 @@ if __name__ == '__main__':
     if not wallet:
         print("WARNING: Trading wallet not configured")
 
-    print("\nStarting Flask app...")
+    print("\nStarting Flask development server...")
     print("Visit http://127.0.0.1:5001 in your browser")
+    print("(For production use gunicorn - see README)")
 
-    app.run(debug=True, port=5001)
+    app.run(debug=True, port=5001, threaded=True)
@@ -5,18 +5,21 @@ Polymarket AI Trading Agent - CLI Entry Point
 Usage:
     python main.py              # Run agent in dry-run mode
     python main.py --analyze    # Only fetch and analyze markets
+    python main.py --analyze --no-cache  # ...ignoring the market cache
     python main.py --status     # Check configuration status
     python main.py --live       # Run with live trading (caution!)
 """
 import argparse
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from src.agent import PolymarketAgent, create_agent
-from src.market.polymarket import fetch_active_markets, print_markets
-from src.analysis.ai_analyzer import get_analyzer
-from src.trading.wallet import get_wallet
-from src.utils.kelly import KellyCriterion
+# Project modules (web3, CLOB client, LLM client) are imported inside the
+# cmd_* functions so `--help` and the lighter commands start quickly
+
+# Repeated --analyze runs reuse the Gamma market list for this long
+MARKETS_CACHE_TTL = 30  # seconds
+# ...and for this much longer serve the cached list instantly while it refreshes
+MARKETS_CACHE_STALE_TTL = 300  # seconds
 
 
 def print_banner():
@@ -31,14 +34,39 @@ def print_banner():
     print()
 
 
-def cmd_status():
+def _fetch_wallet_status():
+    """Set up the trading wallet and read its balances (None, None if not configured)"""
+    from src.trading.wallet import get_wallet
+
+    wallet = get_wallet()
+    return wallet, (wallet.get_status_bundle() if wallet else None)
+
+
+def prefetch_status(pool: ThreadPoolExecutor):
+    """Start the --status network work so it overlaps with the banner output"""
+    from src.analysis.ai_analyzer import get_analyzer
+
+    return pool.submit(get_analyzer), pool.submit(_fetch_wallet_status)
+
+
+def cmd_status(prefetched=None):
     """Check and display configuration status"""
+    from src.utils.kelly import KellyCriterion
+
+    if prefetched is None:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            return cmd_status(prefetch_status(pool))
+
     print_banner()
     print("CONFIGURATION STATUS\n")
 
+    # Analyzer and wallet are set up concurrently - each does its own key derivation / RPC setup
+    analyzer_future, wallet_future = prefetched
+    analyzer = analyzer_future.result()
+    wallet, balances = wallet_future.result()
+
     # Check AI (BlockRun)
     print("[AI Analysis - BlockRun]")
-    analyzer = get_analyzer()
     if analyzer:
         print(f"  Status: CONFIGURED")
         print(f"  Wallet: {analyzer.wallet_address}")
@@ -49,15 +77,14 @@ def cmd_status():
 
     # Check Trading Wallet
     print("[Trading Wallet - Polygon]")
-    wallet = get_wallet()
     if wallet:
         print(f"  Status: CONFIGURED")
         print(f"  Address: {wallet.address}")
-        balances = wallet.get_balances()
+        # Balances + allowance were read in a single multicall round trip
         print(f"  MATIC: {balances['matic']:.4f}")
         print(f"  USDC: {balances['usdc']:.2f}")
 
-        if wallet.check_approval():
+        if balances['allowance'] >= 1.0:
             print(f"  Polymarket Approval: OK")
         else:
             print(f"  Polymarket Approval: NEEDED")
@@ -76,14 +103,32 @@ def cmd_status():
     print()
 
 
-def cmd_analyze():
+def prefetch_markets(pool: ThreadPoolExecutor, use_cache: bool = True):
+    """Start the --analyze market fetch so it overlaps with the banner output"""
+    from src.market.polymarket import fetch_active_markets
+
+    return pool.submit(
+        fetch_active_markets,
+        limit=20,
+        cache_ttl=MARKETS_CACHE_TTL if use_cache else None,
+        stale_ttl=MARKETS_CACHE_STALE_TTL
+    )
+
+
+def cmd_analyze(use_cache: bool = True, markets_future=None):
     """Fetch markets and run AI analysis"""
+    from src.analysis.ai_analyzer import get_analyzer
+
+    if markets_future is None:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return cmd_analyze(use_cache, prefetch_markets(pool, use_cache))
+
     print_banner()
     print("MARKET ANALYSIS\n")
 
     # Fetch markets
     print("Fetching markets...")
-    markets = fetch_active_markets(limit=20)
+    markets = markets_future.result()
 
     if not markets:
         print("Failed to fetch markets")
@@ -121,6 +166,8 @@ def cmd_analyze():
 
 def cmd_run(live: bool = False):
     """Run the full agent"""
+    from src.agent import create_agent
+
     print_banner()
 
     if live:
@@ -181,6 +228,12 @@ def main():
         help="Fetch markets and run AI analysis"
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch fresh market data (skip the short-lived disk cache)"
+    )
+
     parser.add_argument(
         "--live",
         action="store_true",
@@ -189,10 +242,16 @@ def main():
 
     args = parser.parse_args()
 
+    # Kick off network I/O as soon as the sub-command is known
     if args.status:
-        cmd_status()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            cmd_status(prefetch_status(pool))
     elif args.analyze:
-        cmd_analyze()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            cmd_analyze(
+                use_cache=not args.no_cache,
+                markets_future=prefetch_markets(pool, use_cache=not args.no_cache)
+            )
     else:
         cmd_run(live=args.live)
 
@@ -1,6 +1,14 @@
 """
 Polymarket AI Trading Agent
 """
-from .agent import PolymarketAgent, create_agent
 
 __all__ = ["PolymarketAgent", "create_agent"]
+
+
+def __getattr__(name):
+    # Import the agent stack (web3, CLOB client) on first use, so that
+    # `from src.market import ...` and `main.py --help` stay cheap
+    if name in __all__:
+        from . import agent
+        return getattr(agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,6 +2,7 @@
 Polymarket Trading Agent
 Main coordinator that orchestrates market data, AI analysis, and trading
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
@@ -11,6 +12,9 @@ from .trading.wallet import PolygonWallet, get_wallet
 from .trading.executor import TradeExecutor
 from .utils.kelly import KellyCriterion
 
+# Repeated run() calls share one Gamma fetch within this window
+MARKETS_CACHE_TTL = 30  # seconds
+
 
 class PolymarketAgent:
     """
@@ -80,23 +84,28 @@ class PolymarketAgent:
 
         print(f"Found {len(markets)} active markets")
 
-        # Step 2: AI Analysis
-        if self.analyzer:
-            print(f"\n[2/4] Analyzing with AI...")
-            print(f"Wallet: {self.analyzer.wallet_address}")
+        # Steps 2 + 3 only depend on markets - the LLM call runs in the
+        # background while recommendations are computed locally
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            analysis_future = pool.submit(self.analyze, markets) if self.analyzer else None
+            recommendations = self.generate_recommendations(markets[:5])
 
-            analysis = self.analyze(markets)
-            results["analysis"] = analysis
+            # Step 2: AI Analysis
+            if analysis_future:
+                print(f"\n[2/4] Analyzing with AI...")
+                print(f"Wallet: {self.analyzer.wallet_address}")
 
-            if analysis:
-                print("\n--- AI Analysis ---")
-                print(analysis[:1000] + "..." if len(analysis) > 1000 else analysis)
-        else:
-            print("\n[2/4] AI analysis skipped (not configured)")
+                analysis = analysis_future.result()
+                results["analysis"] = analysis
+
+                if analysis:
+                    print("\n--- AI Analysis ---")
+                    print(analysis[:1000] + "..." if len(analysis) > 1000 else analysis)
+            else:
+                print("\n[2/4] AI analysis skipped (not configured)")
 
         # Step 3: Generate recommendations
         print("\n[3/4] Generating trade recommendations...")
-        recommendations = self.generate_recommendations(markets[:5])
         results["recommendations"] = recommendations
 
         for rec in recommendations:
@@ -119,7 +128,7 @@ class PolymarketAgent:
 
     def fetch_markets(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Fetch active markets from Polymarket"""
-        raw_markets = self.market_client.fetch_markets(limit=limit)
+        raw_markets = self.market_client.fetch_markets(limit=limit, cache_ttl=MARKETS_CACHE_TTL)
 
         if not raw_markets:
             return []
@@ -152,7 +161,8 @@ class PolymarketAgent:
         for market in markets:
             # Placeholder: Use market volume as a proxy for confidence
             # In production, use AI probability estimates
-            volume = market.get("volume", 0)
+            # (Gamma returns volume as a string)
+            volume = float(market.get("volume", 0) or 0)
 
             if volume > 10000:
                 # Assume market odds from outcomes if available
@@ -213,8 +223,9 @@ class PolymarketAgent:
 
         if self.wallet:
             status["trading_wallet"] = self.wallet.address
-            status["usdc_balance"] = self.wallet.get_usdc_balance()
-            status["approved"] = self.wallet.check_approval()
+            wallet_status = self.wallet.get_status_bundle()
+            status["usdc_balance"] = wallet_status["usdc"]
+            status["approved"] = wallet_status["allowance"] >= 1.0
 
         return status
 
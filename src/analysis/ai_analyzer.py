@@ -3,11 +3,25 @@ AI Market Analyzer - Powered by BlockRun
 Uses BlockRun SDK for pay-per-request AI analysis without API keys.
 """
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Upper bound on in-flight BlockRun calls across all threads
+# (parallel markets x parallel consensus models)
+MAX_CONCURRENT_LLM_CALLS = 8
+_llm_slots = threading.BoundedSemaphore(MAX_CONCURRENT_LLM_CALLS)
+
+# "FIELD: value" lines in model responses
+_RESPONSE_FIELD_RE = re.compile(r"^[ \t]*(PROBABILITY|CONFIDENCE|REASONING):[ \t]*(.*)$", re.M)
+# Numeric field values - checked up front so malformed output doesn't raise
+_PROBABILITY_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%?")
+_CONFIDENCE_RE = re.compile(r"\d+")
+
 # Import BlockRun SDK
 try:
     from blockrun_llm import LLMClient
@@ -89,18 +103,63 @@ Focus on:
         system = "You are a professional prediction market analyst specializing in identifying profitable opportunities."
 
         try:
-            result = self.client.chat(
-                model=model,
-                prompt=prompt,
-                system=system,
-                max_tokens=2048,
-                temperature=0.7
-            )
+            with _llm_slots:
+                result = self.client.chat(
+                    model=model,
+                    prompt=prompt,
+                    system=system,
+                    max_tokens=2048,
+                    temperature=0.7
+                )
             return result
         except Exception as e:
             print(f"Analysis failed: {e}")
             return None
 
+    def analyze_markets_sharded(
+        self,
+        markets: List[Dict[str, Any]],
+        shards: int = 4,
+        model_tier: str = "deep"
+    ) -> Optional[str]:
+        """
+        Analyze a large market list as parallel shards (one LLM call each)
+
+        analyze_markets() only looks at 10 markets per call, so bigger batches are
+        split into contiguous slices of at most 10 and analyzed concurrently
+        (markets beyond shards x 10 are ignored, like analyze_markets' own cap)
+
+        Args:
+            markets: List of market data dictionaries
+            shards: Maximum number of parallel LLM calls
+            model_tier: "fast", "standard", "deep", or "premium"
+
+        Returns:
+            Combined analysis text (one section per shard) or None if all shards failed
+        """
+        if not markets:
+            return None
+
+        shard_size = min(10, -(-len(markets) // shards))  # ceil division
+        slices = [
+            (start, markets[start:start + shard_size])
+            for start in range(0, min(len(markets), shards * shard_size), shard_size)
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(slices)) as pool:
+            futures = [
+                (start, chunk, pool.submit(self.analyze_markets, chunk, model_tier))
+                for start, chunk in slices
+            ]
+
+        sections = []
+        for start, chunk, future in futures:
+            analysis = future.result()
+            if analysis:
+                sections.append(f"=== Markets {start + 1}-{start + len(chunk)} ===\n{analysis}")
+
+        return "\n\n".join(sections) if sections else None
+
     def quick_check(self, question: str) -> Optional[str]:
         """
         Quick probability check for a single market
@@ -162,22 +221,10 @@ REASONING: [1-2 sentence explanation]"""
                 temperature=0.3
             )
 
-            # Parse response
-            lines = result.strip().split("\n")
-            ai_prob = current_odds  # Default to market odds
-            confidence = 5
-
-            for line in lines:
-                if line.startswith("PROBABILITY:"):
-                    try:
-                        ai_prob = float(line.split(":")[1].strip().replace("%", "")) / 100
-                    except:
-                        pass
-                elif line.startswith("CONFIDENCE:"):
-                    try:
-                        confidence = int(line.split(":")[1].strip())
-                    except:
-                        pass
+            # Parse response (defaults to market odds)
+            parsed = _parse_llm_response(result, current_odds)
+            ai_prob = parsed["probability"]
+            confidence = parsed["confidence"]
 
             edge = ai_prob - current_odds
 
@@ -227,7 +274,63 @@ REASONING: [1-2 sentence explanation]"""
         Returns:
             Dict with consensus decision, individual model results, confidence
         """
-        # Build prompt with whale data if available
+        # Query all models in parallel - latency is the slowest model, not the sum
+        spec = {"question": question, "current_odds": current_odds, "whale_data": whale_data}
+        return self.analyze_markets_consensus([spec], max_workers=len(self.CONSENSUS_MODELS))[0]
+
+    def analyze_markets_consensus(
+        self,
+        market_specs: List[Dict[str, Any]],
+        max_workers: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Consensus analysis for many markets at once
+
+        All markets x models calls go through one thread pool, so the batch
+        takes about as long as the slowest call (bounded by MAX_CONCURRENT_LLM_CALLS)
+
+        Args:
+            market_specs: Dicts with question, current_odds and optional whale_data
+            max_workers: Thread pool size
+
+        Returns:
+            consensus_analysis() results in the same order as market_specs
+        """
+        if not market_specs:
+            return []
+
+        results = [[] for _ in market_specs]
+        errors = [[] for _ in market_specs]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = []
+            for idx, spec in enumerate(market_specs):
+                prompt = self._build_consensus_prompt(
+                    spec["question"], spec["current_odds"], spec.get("whale_data")
+                )
+                for model in self.CONSENSUS_MODELS:
+                    futures.append((idx, model, pool.submit(
+                        self._query_consensus_model, model, prompt, spec["current_odds"]
+                    )))
+
+        for idx, model, future in futures:
+            try:
+                results[idx].append(future.result())
+            except Exception as e:
+                errors[idx].append({"model": model, "error": str(e)})
+
+        return [
+            self._aggregate_consensus(results[idx], errors[idx], spec["current_odds"], spec.get("whale_data"))
+            for idx, spec in enumerate(market_specs)
+        ]
+
+    def _build_consensus_prompt(
+        self,
+        question: str,
+        current_odds: float,
+        whale_data: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build the consensus prompt, including whale data if available"""
         whale_context = ""
         if whale_data and whale_data.get("has_smart_money_activity"):
             whale_context = f"""
@@ -239,7 +342,7 @@ SMART MONEY SIGNALS:
 - Number of top traders active: {whale_data.get('top_traders_count', 0)}
 """
 
-        prompt = f"""Analyze this prediction market:
+        return f"""Analyze this prediction market:
 
 Question: {question}
 Current market odds: {current_odds*100:.1f}% YES
@@ -249,49 +352,14 @@ PROBABILITY: [your estimated probability 0-100]
 CONFIDENCE: [your confidence 1-10]
 REASONING: [1 sentence]"""
 
-        results = []
-        errors = []
-
-        # Query each model
-        for model in self.CONSENSUS_MODELS:
-            try:
-                response = self.client.chat(
-                    model=model,
-                    prompt=prompt,
-                    max_tokens=150,
-                    temperature=0.3
-                )
-
-                # Parse response
-                ai_prob = current_odds
-                confidence = 5
-                reasoning = ""
-
-                for line in response.strip().split("\n"):
-                    if line.startswith("PROBABILITY:"):
-                        try:
-                            ai_prob = float(line.split(":")[1].strip().replace("%", "")) / 100
-                        except:
-                            pass
-                    elif line.startswith("CONFIDENCE:"):
-                        try:
-                            confidence = int(line.split(":")[1].strip())
-                        except:
-                            pass
-                    elif line.startswith("REASONING:"):
-                        reasoning = line.split(":", 1)[1].strip() if ":" in line else ""
-
-                results.append({
-                    "model": model.split("/")[-1],
-                    "probability": ai_prob,
-                    "confidence": confidence,
-                    "reasoning": reasoning,
-                    "edge": ai_prob - current_odds
-                })
-
-            except Exception as e:
-                errors.append({"model": model, "error": str(e)})
-
+    def _aggregate_consensus(
+        self,
+        results: List[Dict[str, Any]],
+        errors: List[Dict[str, Any]],
+        current_odds: float,
+        whale_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Combine individual model votes into a consensus decision"""
         if not results:
             return {
                 "consensus": "ERROR",
@@ -338,14 +406,69 @@ REASONING: [1 sentence]"""
             "whale_data": whale_data
         }
 
+    def _query_consensus_model(
+        self,
+        model: str,
+        prompt: str,
+        current_odds: float
+    ) -> Dict[str, Any]:
+        """Query one consensus model and parse its vote (raises on API failure)"""
+        with _llm_slots:
+            response = self.client.chat(
+                model=model,
+                prompt=prompt,
+                max_tokens=150,
+                temperature=0.3
+            )
+
+        parsed = _parse_llm_response(response, current_odds)
+        return {
+            "model": model.split("/")[-1],
+            "probability": parsed["probability"],
+            "confidence": parsed["confidence"],
+            "reasoning": parsed["reasoning"],
+            "edge": parsed["probability"] - current_odds
+        }
+
+
+def _parse_llm_response(text: str, default_prob: float) -> Dict[str, Any]:
+    """
+    Parse PROBABILITY / CONFIDENCE / REASONING lines from a model response
+
+    Unparseable values keep their defaults (market odds, confidence 5)
+    """
+    parsed = {"probability": default_prob, "confidence": 5, "reasoning": ""}
+
+    for match in _RESPONSE_FIELD_RE.finditer(text):
+        field, value = match.group(1), match.group(2).strip()
+        if field == "PROBABILITY":
+            number = _PROBABILITY_RE.fullmatch(value)
+            if number:
+                parsed["probability"] = float(number.group(1)) / 100
+        elif field == "CONFIDENCE":
+            if _CONFIDENCE_RE.fullmatch(value):
+                parsed["confidence"] = int(value)
+        else:
+            parsed["reasoning"] = value
+
+    return parsed
+
+
+# Global instance
+_analyzer = None
+
 
 def get_analyzer() -> Optional[AIAnalyzer]:
-    """Get an AIAnalyzer instance if BlockRun is configured"""
-    try:
-        return AIAnalyzer()
-    except Exception as e:
-        print(f"Failed to initialize AI analyzer: {e}")
-        return None
+    """Get the shared AIAnalyzer instance if BlockRun is configured"""
+    global _analyzer
+
+    if _analyzer is None:
+        try:
+            _analyzer = AIAnalyzer()
+        except Exception as e:
+            print(f"Failed to initialize AI analyzer: {e}")
+            return None
+    return _analyzer
 
 
 # CLI usage
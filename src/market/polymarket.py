@@ -2,20 +2,55 @@
 Polymarket Market Data Module
 Fetches market data from Polymarket Gamma API
 """
-import requests
+import heapq
+import json
+import logging
+import threading
 import time
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
 
+from urllib3.util.request import ACCEPT_ENCODING
+
+# orjson parses the market list several times faster (optional dependency)
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from ..utils.http_session import get_session
+from ..utils.disk_cache import cache_get_entry, cache_set
+
+logger = logging.getLogger(__name__)
 
 # API Configuration
 GAMMA_API_URL = "https://gamma-api.polymarket.com/markets"
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
     "Accept": "application/json",
+    # Only codings urllib3 can decode here (adds br/zstd when brotli/zstandard are installed)
+    "Accept-Encoding": ACCEPT_ENCODING,
     "Cache-Control": "no-cache"
 }
 
+# Cache keys with a background (stale-while-revalidate) refresh in flight
+_refreshing: set = set()
+_refreshing_lock = threading.Lock()
+
+# In-process copy of recent responses in front of the disk cache
+MEMORY_CACHE_MAX = 32
+_memory_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}  # key -> (fetched_at, markets)
+_memory_cache_lock = threading.Lock()
+
+
+def _remember(cache_key: str, markets: List[Dict[str, Any]], fetched_at: float):
+    """Store a response in the in-process cache (oldest entry evicted when full)"""
+    with _memory_cache_lock:
+        _memory_cache.pop(cache_key, None)
+        _memory_cache[cache_key] = (fetched_at, markets)
+        if len(_memory_cache) > MEMORY_CACHE_MAX:
+            _memory_cache.pop(next(iter(_memory_cache)))
+
 
 class PolymarketClient:
     """Client for fetching Polymarket data"""
@@ -23,12 +58,15 @@ class PolymarketClient:
     def __init__(self):
         self.api_url = GAMMA_API_URL
         self.headers = DEFAULT_HEADERS
+        self.session = get_session()
 
     def fetch_markets(
         self,
         limit: int = 50,
         active: bool = True,
-        closed: bool = False
+        closed: bool = False,
+        cache_ttl: Optional[float] = None,
+        stale_ttl: float = 0
     ) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch markets from Polymarket Gamma API
@@ -37,10 +75,89 @@ class PolymarketClient:
             limit: Maximum number of markets to fetch
             active: Only fetch active markets
             closed: Include closed markets
+            cache_ttl: Reuse an on-disk response younger than this many seconds
+                (None = always hit the API). A stale copy is used if the API fails.
+            stale_ttl: Past cache_ttl, keep serving the cached copy for this many more
+                seconds while a background thread refreshes it (stale-while-revalidate)
 
         Returns:
             List of market dictionaries or None if failed
         """
+        if not cache_ttl:
+            return self._request_markets(limit, active, closed)
+
+        cache_key = f"{self.api_url}?limit={limit}&active={active}&closed={closed}"
+        entry = self._cached_entry(cache_key)
+        if entry is not None:
+            markets, age = entry
+            if age < cache_ttl:
+                return markets
+            if age < cache_ttl + stale_ttl:
+                self._refresh_in_background(cache_key, limit, active, closed)
+                return markets
+
+        markets = self._refresh_markets(cache_key, limit, active, closed)
+        if markets is not None:
+            return markets
+
+        # Stale-if-error: better an old market list than none
+        if entry is not None:
+            print("Polymarket API unavailable, using cached markets")
+            return entry[0]
+        return None
+
+    @staticmethod
+    def _cached_entry(cache_key: str) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """Look up (markets, age_seconds) in memory, then on disk"""
+        with _memory_cache_lock:
+            cached = _memory_cache.get(cache_key)
+        if cached is not None:
+            fetched_at, markets = cached
+            return markets, time.time() - fetched_at
+
+        entry = cache_get_entry(cache_key)
+        if entry is not None:
+            markets, age = entry
+            _remember(cache_key, markets, time.time() - age)
+        return entry
+
+    def _refresh_markets(
+        self,
+        cache_key: str,
+        limit: int,
+        active: bool,
+        closed: bool
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Request markets and store them in the memory and disk caches"""
+        markets = self._request_markets(limit, active, closed)
+        if markets is not None:
+            _remember(cache_key, markets, time.time())
+            cache_set(cache_key, markets)
+        return markets
+
+    def _refresh_in_background(self, cache_key: str, limit: int, active: bool, closed: bool):
+        """Refresh a stale cache entry on a daemon thread (at most one per key)"""
+        with _refreshing_lock:
+            if cache_key in _refreshing:
+                return
+            _refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                self._refresh_markets(cache_key, limit, active, closed)
+            finally:
+                with _refreshing_lock:
+                    _refreshing.discard(cache_key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _request_markets(
+        self,
+        limit: int,
+        active: bool,
+        closed: bool
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Request markets from the Gamma API (no caching)"""
         timestamp = int(time.time() * 1000)
 
         params = {
@@ -51,7 +168,7 @@ class PolymarketClient:
         }
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.api_url,
                 params=params,
                 headers=self.headers,
@@ -62,7 +179,7 @@ class PolymarketClient:
                 print(f"Failed to fetch markets: {response.status_code}")
                 return None
 
-            markets = response.json()
+            markets = json_loads(response.content)
 
             if isinstance(markets, dict):
                 print(f"Unexpected response format: {markets}")
@@ -81,17 +198,27 @@ class PolymarketClient:
         """Fetch a specific market by ID"""
         try:
             url = f"{self.api_url}/{market_id}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, headers=self.headers, timeout=10)
 
             if response.status_code == 200:
-                return response.json()
+                return json_loads(response.content)
             return None
         except Exception as e:
             print(f"Error fetching market {market_id}: {e}")
             return None
 
-    def format_market(self, market: Dict[str, Any]) -> Dict[str, Any]:
-        """Format market data for display"""
+    def format_market(
+        self,
+        market: Dict[str, Any],
+        prices: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Format market data for display
+
+        Args:
+            market: Raw Gamma market
+            prices: Already-decoded outcomePrices, if the caller has them
+        """
         end_date = market.get("endDate", "")
         formatted_date = "Unknown"
 
@@ -103,19 +230,9 @@ class PolymarketClient:
                 pass
 
         # Parse outcome prices (YES/NO odds)
-        yes_odds, no_odds = 0.0, 0.0
-        outcome_prices = market.get("outcomePrices", "[]")
-        try:
-            import json
-            if isinstance(outcome_prices, str):
-                prices = json.loads(outcome_prices)
-            else:
-                prices = outcome_prices
-            if len(prices) >= 2:
-                yes_odds = float(prices[0]) if prices[0] else 0.0
-                no_odds = float(prices[1]) if prices[1] else 0.0
-        except:
-            pass
+        yes_odds, no_odds = self._parse_prices(
+            market.get("outcomePrices") if prices is None else prices
+        )
 
         return {
             "id": market.get("id"),
@@ -131,12 +248,21 @@ class PolymarketClient:
             "no_odds": no_odds,
         }
 
+    @staticmethod
+    def _parse_prices(raw: Any) -> Tuple[float, float]:
+        """Parse outcomePrices (JSON string or already-decoded list) into (yes, no) odds"""
+        if not raw:
+            return 0.0, 0.0
+        try:
+            prices = json.loads(raw) if isinstance(raw, str) else raw
+            if len(prices) >= 2:
+                return float(prices[0] or 0), float(prices[1] or 0)
+        except (ValueError, TypeError):
+            pass
+        return 0.0, 0.0
+
     def _parse_token_ids(self, market: Dict[str, Any]) -> List[str]:
         """Extract token IDs from market data"""
-        import logging
-        import json
-        logger = logging.getLogger(__name__)
-
         # Try tokens array first
         tokens = market.get("tokens", [])
         if tokens:
@@ -182,7 +308,10 @@ def fetch_active_markets(
     limit: int = 50,
     min_odds: float = 0.15,
     max_odds: float = 0.85,
-    min_liquidity: float = 5000.0
+    min_liquidity: float = 5000.0,
+    min_volume: float = 0.0,
+    cache_ttl: Optional[float] = None,
+    stale_ttl: float = 0
 ) -> List[Dict[str, Any]]:
     """
     Convenience function to fetch active markets with edge potential
@@ -192,17 +321,16 @@ def fetch_active_markets(
         min_odds: Minimum YES odds (default 15% - filters out <15% markets)
         max_odds: Maximum YES odds (default 85% - filters out >85% markets)
         min_liquidity: Minimum liquidity in USD (default $5,000)
+        min_volume: Minimum traded volume in USD (checked before any formatting)
+        cache_ttl: Reuse an on-disk Gamma response younger than this many seconds
+        stale_ttl: Extra seconds a stale response is served while it refreshes in background
 
     Returns:
         List of formatted market data with trading opportunity potential
     """
-    import logging
-    import json
-    logger = logging.getLogger(__name__)
-
     client = PolymarketClient()
     # Fetch more to filter out expired and extreme-odds markets
-    markets = client.fetch_markets(limit=limit * 10)
+    markets = client.fetch_markets(limit=limit * 10, cache_ttl=cache_ttl, stale_ttl=stale_ttl)
 
     if not markets:
         logger.warning("Polymarket API returned no markets")
@@ -211,25 +339,13 @@ def fetch_active_markets(
     logger.info(f"Polymarket API returned {len(markets)} raw markets")
 
     # Filter for markets that haven't ended yet (use UTC for consistency)
-    from datetime import timezone
-    now = datetime.now(timezone.utc).replace(tzinfo=None)  # UTC without tzinfo for comparison
+    now = datetime.now(timezone.utc)
     future_markets = []
 
     for m in markets:
-        end_date_str = m.get("endDate", "")
-        if end_date_str:
-            try:
-                # Parse ISO date - handle timezone properly
-                clean_date = end_date_str.replace("Z", "")
-                if "+" in clean_date:
-                    clean_date = clean_date.split("+")[0]
-                end_date = datetime.fromisoformat(clean_date)
-                if end_date > now:
-                    future_markets.append(m)
-            except Exception as e:
-                # Include if we can't parse the date
-                future_markets.append(m)
-        else:
+        end_date = _parse_end_date(m.get("endDate"))
+        # Include if there is no date or we can't parse it
+        if end_date is None or end_date > now:
             future_markets.append(m)
 
     logger.info(f"After date filter: {len(future_markets)} future markets")
@@ -237,8 +353,9 @@ def fetch_active_markets(
     # Filter by odds range (exclude extreme markets like 99/1)
     tradeable_markets = []
     for m in future_markets:
-        # Parse YES odds from outcomePrices
+        # Parse YES odds from outcomePrices (kept so format_market doesn't decode it again)
         outcome_prices = m.get("outcomePrices", "[]")
+        prices = None
         try:
             if isinstance(outcome_prices, str):
                 prices = json.loads(outcome_prices)
@@ -251,24 +368,38 @@ def fetch_active_markets(
         except:
             yes_odds = 0.5
 
-        # Check liquidity
+        # Check liquidity and volume
         liquidity = float(m.get('liquidity', 0) or 0)
+        volume = float(m.get('volume', 0) or 0)
 
-        # Filter: odds must be in tradeable range AND have sufficient liquidity
-        if min_odds <= yes_odds <= max_odds and liquidity >= min_liquidity:
-            tradeable_markets.append(m)
+        # Filter: odds must be in tradeable range AND have sufficient liquidity/volume
+        if min_odds <= yes_odds <= max_odds and liquidity >= min_liquidity and volume >= min_volume:
+            tradeable_markets.append((volume, m, prices))
         else:
             logger.debug(f"Filtered out: {m.get('question', '')[:50]}... "
-                        f"(odds={yes_odds:.0%}, liq=${liquidity:,.0f})")
+                        f"(odds={yes_odds:.0%}, liq=${liquidity:,.0f}, vol=${volume:,.0f})")
 
     logger.info(f"After odds/liquidity filter: {len(tradeable_markets)} tradeable markets "
                 f"(odds {min_odds:.0%}-{max_odds:.0%}, min liq ${min_liquidity:,.0f})")
 
-    # Sort by volume (highest first) for more interesting markets
-    tradeable_markets.sort(key=lambda x: float(x.get('volume', 0) or 0), reverse=True)
+    # Highest volume first for more interesting markets - only the requested limit
+    top_markets = heapq.nlargest(limit, tradeable_markets, key=lambda x: x[0])
+
+    return [client.format_market(m, prices) for _, m, prices in top_markets]
+
 
-    # Return only the requested limit
-    return [client.format_market(m) for m in tradeable_markets[:limit]]
+def _parse_end_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Gamma endDate as an aware UTC datetime (None if missing/unparseable)"""
+    if not value:
+        return None
+    try:
+        # Older Pythons' fromisoformat doesn't accept the "Z" suffix
+        end_date = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    if end_date.tzinfo is None:
+        end_date = end_date.replace(tzinfo=timezone.utc)
+    return end_date
 
 
 def print_markets(markets: List[Dict[str, Any]]) -> None:
@@ -1 +1 @@
-from .trades import get_smart_money_summary, get_trade_summary
+from .trades import get_smart_money_summary, get_smart_money_summaries, get_trade_summary, create_client
@@ -3,10 +3,26 @@
 获取某个市场的所有交易记录
 只关注大仓位交易者 - 小仓位没有意义
 """
+import asyncio
+import heapq
 import httpx
-from datetime import datetime, timedelta
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-import statistics
+
+# orjson 解析大数组更快 (可选依赖, 没装就用标准库)
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# HTTP/2 需要 h2 包 (httpx[http2]) - 并发请求多路复用同一个连接
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Polymarket API Endpoints (from informedge)
 DATA_API = "https://data-api.polymarket.com"
@@ -15,11 +31,136 @@ GAMMA_API = "https://gamma-api.polymarket.com"
 # 最小仓位阈值 - 低于此金额的交易不考虑
 MIN_POSITION_AMOUNT = 500  # $500 USDC
 
+# 每次 /trades 拉取的条数 (API 单页上限), 一页基本覆盖 24h 窗口, 不用翻页
+TRADES_FETCH_LIMIT = 500
+
+REQUEST_TIMEOUT = 15.0
+REQUEST_HEADERS = {
+    "User-Agent": "PolymarketAgent/1.0",
+    "Accept": "application/json"
+}
+
+
+# 限流 - Polymarket 在返回 429 之前会先排队 (Cloudflare), 延迟悄悄从 50ms 涨到 500ms
+# 所以主动控制并发, 而不是等 429
+MAX_CONCURRENT_REQUESTS = 30
+RATE_LIMIT_HEADROOM = 0.2  # 剩余配额低于 20% 时主动减速
+RATE_LIMIT_PAUSE = 0.05
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # 秒, 指数退避: 0.5, 1, 2
+
+
+class RateLimitedClient:
+    """
+    httpx.AsyncClient 的限流包装
+    - 共享 Semaphore 限制同时在途的请求数
+    - X-RateLimit-Remaining 快用完时主动 sleep
+    - 429 时按 Retry-After (没有就指数退避) 重试
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_REQUESTS):
+        self._client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            headers=REQUEST_HEADERS,
+            http2=HTTP2_AVAILABLE
+        )
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        for attempt in range(MAX_RETRIES + 1):
+            async with self._sem:
+                response = await self._client.get(url, **kwargs)
+                await self._throttle(response)
+
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                return response
+            await asyncio.sleep(self._retry_delay(response, attempt))
+        return response
+
+    async def _throttle(self, response: httpx.Response):
+        """配额快用完时在 semaphore 内稍等, 让同一时刻的其他请求也慢下来"""
+        try:
+            remaining = int(response.headers.get("X-RateLimit-Remaining", 1000))
+            limit = int(response.headers.get("X-RateLimit-Limit", 1000))
+        except ValueError:
+            return
+        if remaining < RATE_LIMIT_HEADROOM * limit:
+            await asyncio.sleep(RATE_LIMIT_PAUSE)
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return RETRY_BACKOFF * (2 ** attempt)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+def create_client() -> RateLimitedClient:
+    """
+    创建可复用的 (限流) client
+    在同一个事件循环内传给下面的函数, 多个市场共享连接池和并发配额 (避免每次 TLS 握手)
+    """
+    return RateLimitedClient()
+
+
+# 同一市场并发的 /trades 请求合并成一次 - (event loop, market_id) -> Task
+# min_amount 过滤在拿到数据之后做, 所以不同阈值的调用也能共享
+_inflight: dict = {}
+
+# 短时间内的重复请求直接用上次的结果 - market_id -> (fetched_at, raw_trades)
+TRADES_CACHE_TTL = 30  # 秒
+TRADES_CACHE_MAX = 256
+_trades_cache: dict = {}
+
+
+async def _fetch_raw_trades(market_id: str, http: RateLimitedClient) -> list:
+    """请求原始交易记录; 先查短 TTL 缓存, 已有同一市场的请求在途时直接等它的结果"""
+    cached = _trades_cache.get(market_id)
+    if cached and time.monotonic() - cached[0] < TRADES_CACHE_TTL:
+        return cached[1]
+
+    key = (asyncio.get_running_loop(), market_id)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_request_trades(market_id, http))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: 某个调用方被取消时不影响其他等待者
+    return await asyncio.shield(task)
+
+
+async def _request_trades(market_id: str, http: RateLimitedClient) -> list:
+    response = await http.get(
+        f"{DATA_API}/trades",
+        params={
+            "market": market_id,
+            "limit": TRADES_FETCH_LIMIT
+        }
+    )
+    response.raise_for_status()
+    raw_trades = json_loads(response.content)
+
+    _trades_cache.pop(market_id, None)
+    if len(_trades_cache) >= TRADES_CACHE_MAX:
+        _trades_cache.pop(next(iter(_trades_cache)), None)
+    _trades_cache[market_id] = (time.monotonic(), raw_trades)
+    return raw_trades
+
 
 async def get_recent_trades(
     market_id: str,
     hours: int = 24,
-    min_amount: float = MIN_POSITION_AMOUNT
+    min_amount: float = MIN_POSITION_AMOUNT,
+    client: Optional[RateLimitedClient] = None
 ) -> list[dict]:
     """
     获取市场的最近大额交易记录 (真实 API)
@@ -27,6 +168,8 @@ async def get_recent_trades(
     只返回仓位 >= min_amount 的交易
     小仓位的交易没有太多参考价值
 
+    client: 可选的共享 client (由调用方负责关闭), 不传则临时创建
+
     返回:
     [
         {
@@ -42,44 +185,45 @@ async def get_recent_trades(
     ]
     """
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            # Call Polymarket Data API
-            response = await client.get(
-                f"{DATA_API}/trades",
-                params={
-                    "market": market_id,
-                    "limit": 200
-                },
-                headers={
-                    "User-Agent": "PolymarketAgent/1.0",
-                    "Accept": "application/json"
-                }
-            )
-            response.raise_for_status()
-            raw_trades = response.json()
+        async with (nullcontext(client) if client else create_client()) as http:
+            # Call Polymarket Data API (shared with concurrent callers for the same market)
+            raw_trades = await _fetch_raw_trades(market_id, http)
 
             if not raw_trades:
                 return []
 
+            # 时间窗口在本地过滤 - /trades 没有时间范围参数, 且原始数据要在不同窗口的调用间共享
+            cutoff = time.time() - hours * 3600
+
             # Transform to our format
             trades = []
             for t in raw_trades:
                 try:
                     size = float(t.get("size", 0))
+                    # 价格 <= 1, 金额不会超过份数 - 小单不用再解析 price
+                    if size < min_amount:
+                        continue
                     price = float(t.get("price", 0))
                     amount = size * price  # USDC value
 
                     if amount < min_amount:
                         continue
 
-                    # Determine position based on asset name (YES/NO token)
-                    asset = t.get("asset", "").upper()
-                    if "YES" in asset or t.get("outcome") == "Yes":
+                    timestamp = t.get("timestamp", t.get("createdAt", ""))
+                    ts = _parse_timestamp(timestamp)
+                    if ts is not None and ts < cutoff:
+                        continue
+
+                    # Determine position: outcome 字段已经是规范的 "Yes"/"No",
+                    # 只有缺失时才回退到 asset 名称 (YES/NO token)
+                    outcome = t.get("outcome")
+                    if outcome == "Yes":
                         position = "YES"
-                    elif "NO" in asset or t.get("outcome") == "No":
+                    elif outcome == "No":
                         position = "NO"
                     else:
-                        position = "YES"  # Default
+                        asset = t.get("asset", "").upper()
+                        position = "NO" if "NO" in asset and "YES" not in asset else "YES"  # Default YES
 
                     trades.append({
                         "trader": t.get("maker", t.get("taker", "Unknown")),
@@ -88,7 +232,7 @@ async def get_recent_trades(
                         "amount": amount,
                         "size": size,
                         "price": price,
-                        "timestamp": t.get("timestamp", t.get("createdAt", "")),
+                        "timestamp": timestamp,
                     })
                 except (ValueError, TypeError):
                     continue
@@ -100,22 +244,34 @@ async def get_recent_trades(
         return []
 
 
-async def get_large_trades(market_id: str, min_amount: float = 1000) -> list[dict]:
+async def get_large_trades(
+    market_id: str,
+    min_amount: float = 1000,
+    client: Optional[RateLimitedClient] = None,
+    k: Optional[int] = None
+) -> list[dict]:
     """
     获取大额交易 (鲸鱼动向)
     这些是最重要的信号
+    k: 只要最大的前 k 笔 (None = 全部)
     """
-    all_trades = await get_recent_trades(market_id, min_amount=min_amount)
+    all_trades = await get_recent_trades(market_id, min_amount=min_amount, client=client)
     # 按金额排序，最大的在前
+    if k is not None:
+        return heapq.nlargest(k, all_trades, key=lambda t: t["amount"])
     return sorted(all_trades, key=lambda t: t["amount"], reverse=True)
 
 
-async def get_trade_summary(market_id: str, min_amount: float = MIN_POSITION_AMOUNT) -> dict:
+async def get_trade_summary(
+    market_id: str,
+    min_amount: float = MIN_POSITION_AMOUNT,
+    client: Optional[RateLimitedClient] = None
+) -> dict:
     """
     汇总大额交易数据
     只统计大仓位交易，小仓位不计入
     """
-    trades = await get_recent_trades(market_id, min_amount=min_amount)
+    trades = await get_recent_trades(market_id, min_amount=min_amount, client=client)
 
     if not trades:
         return {
@@ -132,20 +288,31 @@ async def get_trade_summary(market_id: str, min_amount: float = MIN_POSITION_AMO
             "top_trades": [],
         }
 
-    # 统计大仓位交易
-    buy_yes_volume = sum(t["amount"] for t in trades if t["side"] == "BUY" and t["position"] == "YES")
-    sell_yes_volume = sum(t["amount"] for t in trades if t["side"] == "SELL" and t["position"] == "YES")
-    buy_no_volume = sum(t["amount"] for t in trades if t["side"] == "BUY" and t["position"] == "NO")
-    sell_no_volume = sum(t["amount"] for t in trades if t["side"] == "SELL" and t["position"] == "NO")
-
-    unique_buyers = set(t["trader"] for t in trades if t["side"] == "BUY")
-    unique_sellers = set(t["trader"] for t in trades if t["side"] == "SELL")
+    # 统计大仓位交易 (一次遍历)
+    buy_yes_volume = sell_yes_volume = buy_no_volume = sell_no_volume = 0
+    unique_buyers = set()
+    unique_sellers = set()
+
+    for t in trades:
+        amount = t["amount"]
+        if t["side"] == "BUY":
+            unique_buyers.add(t["trader"])
+            if t["position"] == "YES":
+                buy_yes_volume += amount
+            elif t["position"] == "NO":
+                buy_no_volume += amount
+        elif t["side"] == "SELL":
+            unique_sellers.add(t["trader"])
+            if t["position"] == "YES":
+                sell_yes_volume += amount
+            elif t["position"] == "NO":
+                sell_no_volume += amount
+
+    # Top trades 按金额排序 (heap 取前 10, 不用整体排序)
+    top_trades = heapq.nlargest(10, trades, key=lambda t: t["amount"])
 
     # 最大单笔
-    largest_trade = max(trades, key=lambda t: t["amount"])
-
-    # Top trades 按金额排序
-    top_trades = sorted(trades, key=lambda t: t["amount"], reverse=True)[:10]
+    largest_trade = top_trades[0]
 
     return {
         "total_large_trades": len(trades),
@@ -163,6 +330,37 @@ async def get_trade_summary(market_id: str, min_amount: float = MIN_POSITION_AMO
     }
 
 
+def _parse_timestamp(ts) -> Optional[float]:
+    """
+    交易时间 -> Unix 秒
+    Data API 返回的是 Unix 时间戳 (int), 兼容 ISO 字符串 ("...Z")
+    """
+    if not ts:
+        return None
+    if isinstance(ts, (int, float)):
+        return ts / 1000 if ts > 1e12 else float(ts)  # 毫秒时间戳
+    try:
+        return float(ts)
+    except (TypeError, ValueError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _first_timestamp(trades) -> Optional[float]:
+    """第一个能解析的交易时间 (Unix 秒)"""
+    for t in trades:
+        parsed = _parse_timestamp(t.get("timestamp"))
+        if parsed is not None:
+            return parsed
+    return None
+
+
 def analyze_trade_patterns(trades: list[dict]) -> dict:
     """
     分析交易模式 (来自 informedge)
@@ -179,8 +377,12 @@ def analyze_trade_patterns(trades: list[dict]) -> dict:
         }
 
     # Calculate net flow
-    buy_volume = sum(t["amount"] for t in trades if t["side"] == "BUY")
-    sell_volume = sum(t["amount"] for t in trades if t["side"] == "SELL")
+    buy_volume = sell_volume = 0
+    for t in trades:
+        if t["side"] == "BUY":
+            buy_volume += t["amount"]
+        elif t["side"] == "SELL":
+            sell_volume += t["amount"]
     total_volume = buy_volume + sell_volume
     net_flow = buy_volume - sell_volume
 
@@ -200,23 +402,16 @@ def analyze_trade_patterns(trades: list[dict]) -> dict:
             smart_money_direction = "Neutral"
 
     # Calculate execution speed (trades per minute)
+    # 只需要窗口两端的时间, 不用解析全部 30 个
     execution_speed = None
-    try:
-        timestamps = [t.get("timestamp") for t in trades[:30] if t.get("timestamp")]
-        if len(timestamps) >= 2:
-            times = []
-            for ts in timestamps:
-                try:
-                    clean_ts = ts.replace("Z", "+00:00") if isinstance(ts, str) else str(ts)
-                    times.append(datetime.fromisoformat(clean_ts))
-                except:
-                    pass
-            if len(times) >= 2:
-                duration = abs((times[0] - times[-1]).total_seconds()) / 60
-                if duration > 0:
-                    execution_speed = len(times) / duration
-    except:
-        pass
+    window = trades[:30]
+    if len(window) >= 2:
+        first = _first_timestamp(window)
+        last = _first_timestamp(reversed(window))
+        if first is not None and last is not None:
+            duration = abs(first - last) / 60
+            if duration > 0:
+                execution_speed = len(window) / duration
 
     # Detect patterns
     pattern_detected = False
@@ -231,17 +426,18 @@ def analyze_trade_patterns(trades: list[dict]) -> dict:
         insights.append(f"Net flow: ${net_flow/1000:.1f}K towards {smart_money_direction}")
 
     # Pattern 2: Whale accumulation
-    large_trades = [t for t in trades[:20] if t["amount"] > 5000]
-    if len(large_trades) >= 2:
+    recent = trades[:20]
+    large_amounts = [t["amount"] for t in recent if t["amount"] > 5000]
+    if len(large_amounts) >= 2:
         pattern_detected = True
         pattern_name = "Whale Activity"
-        largest_val = max(t["amount"] for t in large_trades)
-        insights.append(f"{len(large_trades)} whale trades detected (max ${largest_val/1000:.1f}K)")
+        largest_val = max(large_amounts)
+        insights.append(f"{len(large_amounts)} whale trades detected (max ${largest_val/1000:.1f}K)")
         insights.append(f"Smart money is {smart_money_direction}")
 
     # Pattern 3: Retail activity (small average size)
     if not pattern_detected and len(trades) >= 10:
-        avg_size = statistics.mean([t.get("size", 0) for t in trades[:20]])
+        avg_size = sum(t.get("size", 0) for t in recent) / len(recent)
         if avg_size < 100:
             pattern_detected = True
             pattern_name = "Retail Activity"
@@ -263,14 +459,17 @@ def analyze_trade_patterns(trades: list[dict]) -> dict:
     }
 
 
-async def get_smart_money_summary(market_id: str) -> dict:
+async def get_smart_money_summary(
+    market_id: str,
+    client: Optional[RateLimitedClient] = None
+) -> dict:
     """
     获取 smart money (大仓位交易者) 的汇总
     给 AI 一个清晰的信号
 
     使用真实 Polymarket API 数据
     """
-    trades = await get_recent_trades(market_id, min_amount=1000)  # Only $1000+ trades
+    trades = await get_recent_trades(market_id, min_amount=1000, client=client)  # Only $1000+ trades
 
     if not trades:
         return {
@@ -281,25 +480,25 @@ async def get_smart_money_summary(market_id: str) -> dict:
     # Analyze patterns
     pattern_analysis = analyze_trade_patterns(trades)
 
-    # Calculate YES vs NO volume from large traders
-    yes_amount = sum(
-        t["amount"] for t in trades
-        if t["side"] == "BUY" and t["position"] == "YES"
-    )
-    no_amount = sum(
-        t["amount"] for t in trades
-        if t["side"] == "BUY" and t["position"] == "NO"
-    )
-
-    # Also consider sells (selling YES = bearish, selling NO = bullish)
-    sell_yes = sum(
-        t["amount"] for t in trades
-        if t["side"] == "SELL" and t["position"] == "YES"
-    )
-    sell_no = sum(
-        t["amount"] for t in trades
-        if t["side"] == "SELL" and t["position"] == "NO"
-    )
+    # YES vs NO volume from large traders (一次遍历)
+    # selling YES = bearish, selling NO = bullish
+    yes_amount = no_amount = sell_yes = sell_no = 0
+    total_large_volume = 0
+    traders = set()
+    for t in trades:
+        amount = t["amount"]
+        total_large_volume += amount
+        traders.add(t["trader"])
+        if t["side"] == "BUY":
+            if t["position"] == "YES":
+                yes_amount += amount
+            elif t["position"] == "NO":
+                no_amount += amount
+        elif t["side"] == "SELL":
+            if t["position"] == "YES":
+                sell_yes += amount
+            elif t["position"] == "NO":
+                sell_no += amount
 
     # Net bullish/bearish calculation
     bullish_flow = yes_amount + sell_no  # Buying YES or selling NO = bullish
@@ -318,8 +517,8 @@ async def get_smart_money_summary(market_id: str) -> dict:
 
     return {
         "has_smart_money_activity": True,
-        "large_traders_count": len(set(t["trader"] for t in trades)),
-        "total_large_volume": sum(t["amount"] for t in trades),
+        "large_traders_count": len(traders),
+        "total_large_volume": total_large_volume,
         "yes_volume": yes_amount,
         "no_volume": no_amount,
         "bullish_flow": bullish_flow,
@@ -331,3 +530,29 @@ async def get_smart_money_summary(market_id: str) -> dict:
         "insights": pattern_analysis.get("insights", []),
         "top_trades": trades[:5],  # 最重要的 5 笔
     }
+
+
+async def get_smart_money_summaries(
+    market_ids: list[str],
+    client: Optional[RateLimitedClient] = None
+) -> list[Optional[dict]]:
+    """
+    并发获取多个市场的 smart money 汇总
+    总耗时 ≈ 最慢的一个请求, 而不是所有请求之和
+
+    返回与 market_ids 一一对应的列表, 失败的市场为 None
+    """
+    async with (nullcontext(client) if client else create_client()) as http:
+        results = await asyncio.gather(
+            *[get_smart_money_summary(mid, client=http) for mid in market_ids],
+            return_exceptions=True
+        )
+
+    summaries = []
+    for market_id, result in zip(market_ids, results):
+        if isinstance(result, Exception):
+            print(f"Error fetching smart money summary for {market_id}: {result}")
+            summaries.append(None)
+        else:
+            summaries.append(result)
+    return summaries
@@ -8,8 +8,17 @@ When disabled, the application uses local /tmp storage (data lost on redeploymen
 import json
 import logging
 import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
+
+# orjson encodes/decodes the state blobs faster (optional dependency)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +27,31 @@ BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "polymarket-agent-data")
 ORDERS_FILE = "orders.json"
 DECISIONS_FILE = "decisions.json"
 MARKETS_FILE = "markets.json"
+MAX_MARKETS = 100  # Market analyses kept in MARKETS_FILE
+
+# Conditional (read-modify-write) updates retry on concurrent writes
+WRITE_RETRIES = 5
+WRITE_RETRY_BACKOFF = 0.2  # seconds, doubled each attempt
+
+
+def _loads(raw: bytes) -> Dict[str, Any]:
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _payload(key: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Blob layout shared by orders/decisions/markets"""
+    return {
+        key: items,
+        'updated_at': datetime.now().isoformat(),
+        f'total_{key}': len(items)
+    }
+
+
+def _dumps(data: Dict[str, Any]):
+    """Serialize a state blob as indented JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2)
 
 
 class GCSStorage:
@@ -27,19 +61,27 @@ class GCSStorage:
         self.bucket = None
         self.client = None
         self._initialized = False
+        self._init_lock = threading.Lock()  # Reads/writes may run on parallel threads
 
     def _ensure_initialized(self) -> bool:
         """Initialize GCS client and bucket"""
         if self._initialized:
             return True
 
+        with self._init_lock:
+            if self._initialized:
+                return True
+            return self._initialize()
+
+    def _initialize(self) -> bool:
+        """Create the client and verify the bucket (caller holds _init_lock)"""
         try:
             from google.cloud import storage
 
             self.client = storage.Client()
             self.bucket = self.client.bucket(BUCKET_NAME)
 
-            # Verify bucket exists
+            # Verify bucket exists (once per process - gives a clear error for a bad GCS_BUCKET_NAME)
             if not self.bucket.exists():
                 logger.error(f"GCS bucket {BUCKET_NAME} does not exist")
                 return False
@@ -57,20 +99,18 @@ class GCSStorage:
         if not self._ensure_initialized():
             return {}
 
-        try:
-            blob = self.bucket.blob(filename)
-
-            # Check if file exists
-            if not blob.exists():
-                logger.info(f"📂 {filename} does not exist yet, returning empty data")
-                return {}
+        from google.api_core.exceptions import NotFound
 
-            # Download and parse
-            data_str = blob.download_as_text()
-            data = json.loads(data_str)
+        try:
+            # Download directly - a missing blob raises NotFound (no separate exists() probe)
+            data_bytes = self.bucket.blob(filename).download_as_bytes()
+            data = _loads(data_bytes)
             logger.info(f"📥 Loaded {filename} from GCS")
             return data
 
+        except NotFound:
+            logger.info(f"📂 {filename} does not exist yet, returning empty data")
+            return {}
         except Exception as e:
             logger.error(f"Failed to read {filename} from GCS: {e}")
             return {}
@@ -83,7 +123,7 @@ class GCSStorage:
         try:
             blob = self.bucket.blob(filename)
             blob.upload_from_string(
-                json.dumps(data, indent=2),
+                _dumps(data),
                 content_type='application/json'
             )
             logger.info(f"📤 Saved {filename} to GCS")
@@ -93,6 +133,49 @@ class GCSStorage:
             logger.error(f"Failed to write {filename} to GCS: {e}")
             return False
 
+    def _update_json(
+        self,
+        filename: str,
+        update: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> bool:
+        """
+        Read-modify-write a JSON blob without clobbering concurrent writers
+
+        The upload is conditional on the generation that was read; if another
+        writer got there first, re-read and re-apply update (with backoff)
+        """
+        if not self._ensure_initialized():
+            return False
+
+        from google.api_core.exceptions import NotFound, PreconditionFailed
+
+        for attempt in range(WRITE_RETRIES):
+            blob = self.bucket.blob(filename)
+            try:
+                try:
+                    data = _loads(blob.download_as_bytes())
+                    generation = blob.generation
+                except NotFound:
+                    data, generation = {}, 0  # 0 = only create if still missing
+
+                blob.upload_from_string(
+                    _dumps(update(data)),
+                    content_type='application/json',
+                    if_generation_match=generation
+                )
+                logger.info(f"📤 Updated {filename} in GCS")
+                return True
+
+            except PreconditionFailed:
+                logger.info(f"{filename} changed concurrently, retrying ({attempt + 1}/{WRITE_RETRIES})")
+                time.sleep(WRITE_RETRY_BACKOFF * (2 ** attempt))
+            except Exception as e:
+                logger.error(f"Failed to update {filename} in GCS: {e}")
+                return False
+
+        logger.error(f"Gave up updating {filename} after {WRITE_RETRIES} conflicting writes")
+        return False
+
     # ========== Orders Management ==========
 
     def load_orders(self) -> List[Dict[str, Any]]:
@@ -104,21 +187,17 @@ class GCSStorage:
 
     def save_orders(self, orders: List[Dict[str, Any]]) -> bool:
         """Save order history to GCS"""
-        data = {
-            'orders': orders,
-            'updated_at': datetime.now().isoformat(),
-            'total_orders': len(orders)
-        }
-        success = self._write_json(ORDERS_FILE, data)
+        success = self._write_json(ORDERS_FILE, _payload('orders', orders))
         if success:
             logger.info(f"💾 Saved {len(orders)} orders to GCS")
         return success
 
     def add_order(self, order: Dict[str, Any]) -> bool:
         """Add a single order to storage"""
-        orders = self.load_orders()
-        orders.append(order)
-        return self.save_orders(orders)
+        return self._update_json(
+            ORDERS_FILE,
+            lambda data: _payload('orders', data.get('orders', []) + [order])
+        )
 
     # ========== Decisions Management ==========
 
@@ -131,21 +210,17 @@ class GCSStorage:
 
     def save_decisions(self, decisions: List[Dict[str, Any]]) -> bool:
         """Save AI decisions to GCS"""
-        data = {
-            'decisions': decisions,
-            'updated_at': datetime.now().isoformat(),
-            'total_decisions': len(decisions)
-        }
-        success = self._write_json(DECISIONS_FILE, data)
+        success = self._write_json(DECISIONS_FILE, _payload('decisions', decisions))
         if success:
             logger.info(f"💾 Saved {len(decisions)} decisions to GCS")
         return success
 
     def add_decision(self, decision: Dict[str, Any]) -> bool:
         """Add a single AI decision to storage"""
-        decisions = self.load_decisions()
-        decisions.append(decision)
-        return self.save_decisions(decisions)
+        return self._update_json(
+            DECISIONS_FILE,
+            lambda data: _payload('decisions', data.get('decisions', []) + [decision])
+        )
 
     # ========== Markets Management ==========
 
@@ -158,26 +233,22 @@ class GCSStorage:
 
     def save_markets(self, markets: List[Dict[str, Any]]) -> bool:
         """Save analyzed markets to GCS"""
-        data = {
-            'markets': markets,
-            'updated_at': datetime.now().isoformat(),
-            'total_markets': len(markets)
-        }
-        success = self._write_json(MARKETS_FILE, data)
+        success = self._write_json(MARKETS_FILE, _payload('markets', markets))
         if success:
             logger.info(f"💾 Saved {len(markets)} markets to GCS")
         return success
 
     def add_market_analysis(self, market: Dict[str, Any]) -> bool:
         """Add a single market analysis to storage"""
-        markets = self.load_markets()
+        return self.add_market_analyses([market])
 
+    def add_market_analyses(self, new_markets: List[Dict[str, Any]]) -> bool:
+        """Add a batch of market analyses with one read-modify-write"""
         # Keep only last 100 markets to avoid unbounded growth
-        if len(markets) >= 100:
-            markets = markets[-99:]  # Keep last 99, add 1 new = 100
-
-        markets.append(market)
-        return self.save_markets(markets)
+        return self._update_json(
+            MARKETS_FILE,
+            lambda data: _payload('markets', (data.get('markets', []) + new_markets)[-MAX_MARKETS:])
+        )
 
 
 # Global instance
@@ -1,5 +1,15 @@
 """Trading module"""
-from .wallet import PolygonWallet, get_wallet
-from .executor import TradeExecutor, get_executor
 
 __all__ = ["PolygonWallet", "get_wallet", "TradeExecutor", "get_executor"]
+
+
+def __getattr__(name):
+    # The executor pulls in py-clob-client at import time; load it only when
+    # asked for, so `from src.trading.wallet import ...` stays cheap
+    if name in ("PolygonWallet", "get_wallet"):
+        from . import wallet
+        return getattr(wallet, name)
+    if name in ("TradeExecutor", "get_executor"):
+        from . import executor
+        return getattr(executor, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
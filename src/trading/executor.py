@@ -3,11 +3,26 @@ Trade Executor Module
 Handles order placement on Polymarket using py-clob-client
 """
 import os
-import json
 import logging
-from typing import Optional, Dict, Any, Tuple, Union
-from decimal import Decimal
-from dotenv import load_dotenv
+import random
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional, Dict, Any, List, Tuple, TypeVar
+from dotenv import find_dotenv, load_dotenv, set_key
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import ApiCreds, OrderArgs
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.order_builder.constants import BUY, SELL
+
+# Batch order posting (older py-clob-client releases only post one order at a time)
+try:
+    from py_clob_client.clob_types import PostOrdersArgs
+except ImportError:
+    PostOrdersArgs = None
 
 load_dotenv()
 
@@ -21,6 +36,143 @@ CHAIN_ID = 137  # Polygon
 MAX_BET_SIZE = 10.0  # Max $10 per trade for safety
 MIN_CONFIDENCE = 5  # Minimum confidence score (out of 10) - AI must be at least 50% confident
 
+_SIDE_MAP = {"BUY": BUY, "SELL": SELL}
+_TRADE_ACTIONS = frozenset({"BET YES", "BET NO"})
+
+# Orders in a batch are priced and signed on this many threads
+SIGNING_WORKERS = 8
+
+# Order books are reused for this long so back-to-back price checks don't re-hit the CLOB
+ORDERBOOK_CACHE_TTL = 2.0  # seconds
+
+# CLOB retries on rate limiting / transient server errors
+CLOB_MAX_ATTEMPTS = 5
+CLOB_BACKOFF_BASE = 0.5  # seconds, doubled each attempt
+CLOB_BACKOFF_MAX = 8.0  # seconds
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Client-side request budget, so bursts of signals don't trip the CLOB rate limits
+# in the first place. Reads and order posts are limited separately by Polymarket.
+CLOB_READ_RATE = 5.0  # requests/second sustained
+CLOB_READ_BURST = 10
+CLOB_WRITE_RATE = 5.0
+CLOB_WRITE_BURST = 10
+
+T = TypeVar("T")
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Shared by every TradeExecutor in the process - the quota is per API key, not per instance
+_read_limiter = _TokenBucket(CLOB_READ_RATE, CLOB_READ_BURST)
+_write_limiter = _TokenBucket(CLOB_WRITE_RATE, CLOB_WRITE_BURST)
+
+
+def _with_backoff(call: Callable[[], T], what: str, idempotent: bool = True) -> T:
+    """
+    Run a CLOB call, retrying 429s (and, for idempotent reads, 5xx/network
+    errors) with exponential backoff plus jitter
+
+    Order posts pass idempotent=False: a 5xx or dropped connection may still
+    have placed the order, so only an explicit 429 rejection is retried.
+    Every attempt first takes a token from the read or write bucket.
+    """
+    limiter = _read_limiter if idempotent else _write_limiter
+    for attempt in range(CLOB_MAX_ATTEMPTS):
+        limiter.acquire()
+        try:
+            return call()
+        except PolyApiException as e:
+            status = e.status_code
+            retryable = status == 429 or (
+                idempotent and (status is None or status in RETRYABLE_STATUSES)
+            )
+            if not retryable or attempt == CLOB_MAX_ATTEMPTS - 1:
+                raise
+            # py-clob-client doesn't expose response headers, so Retry-After isn't available
+            delay = min(CLOB_BACKOFF_BASE * 2 ** attempt, CLOB_BACKOFF_MAX) + random.uniform(0, 0.25)
+            logger.warning(
+                f"CLOB {what} failed ({status or 'network error'}), "
+                f"retry {attempt + 1}/{CLOB_MAX_ATTEMPTS - 1} in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+
+# Fields read from CLOB orders / balances / book levels
+_RECORD_FIELDS = (
+    'id', 'orderID', 'market', 'asset_id', 'tokenID', 'price', 'size',
+    'side', 'status', 'balance', 'avg_price'
+)
+
+
+def _norm(record: Any) -> Dict[str, Any]:
+    """
+    py-clob-client returns dicts or objects depending on endpoint/version;
+    view either as a dict once so callers can use plain .get() lookups
+    """
+    if isinstance(record, dict):
+        return record
+    return {k: getattr(record, k) for k in _RECORD_FIELDS if hasattr(record, k)}
+
+
+def _remember_api_creds(api_key: str, api_secret: str, passphrase: str):
+    """
+    Keep derived API credentials so they aren't re-derived (a signed round trip)
+
+    Always exported to this process's environment, so later executors skip the
+    derivation; also written to .env when PERSIST_CREDS=true.
+    """
+    creds = {
+        "POLYMARKET_API_KEY": api_key,
+        "POLYMARKET_API_SECRET": api_secret,
+        "POLYMARKET_PASSPHRASE": passphrase,
+    }
+    if not all(creds.values()):
+        return
+    os.environ.update(creds)
+
+    if os.getenv("PERSIST_CREDS", "false").lower() == "true":
+        try:
+            dotenv_path = find_dotenv(usecwd=True) or ".env"
+            for name, value in creds.items():
+                set_key(dotenv_path, name, value)
+            logger.info(f"Saved Polymarket API credentials to {dotenv_path}")
+            return
+        except Exception as e:
+            logger.warning(f"Could not save API credentials to .env: {e}")
+
+    logger.info(f"Add these to .env to avoid re-deriving:")
+    for name, value in creds.items():
+        logger.info(f"{name}={value}")
+
+
+@lru_cache(maxsize=4)
+def _signer_address(private_key: str) -> str:
+    """EOA address for a key - derived once per process, get_executor() builds a new executor per call"""
+    from eth_account import Account
+    return Account.from_key(private_key).address
+
 
 class TradeExecutor:
     """Executes trades on Polymarket using py-clob-client"""
@@ -37,16 +189,24 @@ class TradeExecutor:
             self.private_key = "0x" + self.private_key
 
         # Get wallet address from private key (EOA that signs)
-        from eth_account import Account
-        self.signer_address = Account.from_key(self.private_key).address
+        self.signer_address = _signer_address(self.private_key)
 
         # Polymarket proxy wallet (where funds are held and trades execute)
         # This is the funder address on Polymarket
         self.wallet_address = os.getenv("POLYMARKET_PROXY_WALLET", self.signer_address)
 
+        # Signature type based on wallet setup
+        # 0 = EOA (signer = funder), 2 = Gnosis Safe proxy (most common)
+        self.sig_type = 2 if self.wallet_address != self.signer_address else 0
+
         self.client = None
         self._api_creds = None
         self._initialized = False
+        # token_id -> (monotonic fetch time, orderbook)
+        self._orderbook_cache: Dict[str, Tuple[float, Any]] = {}
+        # token_id -> Future of the fetch in flight, so concurrent lookups share one request
+        self._orderbook_inflight: Dict[str, Future] = {}
+        self._orderbook_lock = threading.Lock()
 
     def _ensure_initialized(self) -> bool:
         """Initialize the CLOB client with API credentials"""
@@ -54,9 +214,6 @@ class TradeExecutor:
             return True
 
         try:
-            from py_clob_client.client import ClobClient
-            from py_clob_client.clob_types import ApiCreds
-
             # Check for stored API credentials (REQUIRED for trading)
             api_key = os.getenv("POLYMARKET_API_KEY")
             api_secret = os.getenv("POLYMARKET_API_SECRET")
@@ -70,16 +227,13 @@ class TradeExecutor:
                     api_secret=api_secret,
                     api_passphrase=passphrase
                 )
-                # Determine signature type based on wallet setup
-                # 0 = EOA (signer = funder), 2 = Gnosis Safe proxy (most common)
-                sig_type = 2 if self.wallet_address != self.signer_address else 0
-                logger.info(f"Using signature_type={sig_type} (proxy={self.wallet_address != self.signer_address})")
+                logger.info(f"Using signature_type={self.sig_type} (proxy={self.sig_type == 2})")
                 self.client = ClobClient(
                     host=CLOB_HOST,
                     chain_id=CHAIN_ID,
                     key=self.private_key,
                     creds=self._api_creds,
-                    signature_type=sig_type,
+                    signature_type=self.sig_type,
                     funder=self.wallet_address
                 )
                 self._initialized = True
@@ -88,15 +242,12 @@ class TradeExecutor:
             else:
                 # Try to create/derive credentials programmatically
                 logger.info("No stored credentials, attempting to create/derive API key...")
-                # Determine signature type based on wallet setup
-                # 0 = EOA (signer = funder), 2 = Gnosis Safe proxy (most common)
-                sig_type = 2 if self.wallet_address != self.signer_address else 0
-                logger.info(f"Using signature_type={sig_type} (proxy={self.wallet_address != self.signer_address})")
+                logger.info(f"Using signature_type={self.sig_type} (proxy={self.sig_type == 2})")
                 self.client = ClobClient(
                     host=CLOB_HOST,
                     chain_id=CHAIN_ID,
                     key=self.private_key,
-                    signature_type=sig_type,
+                    signature_type=self.sig_type,
                     funder=self.wallet_address
                 )
                 try:
@@ -104,16 +255,18 @@ class TradeExecutor:
                     self._api_creds = self.client.create_or_derive_api_creds()
                     logger.info("Obtained API credentials via create_or_derive_api_creds()")
 
-                    # Log credentials for user to save
-                    api_key = self._api_creds.get("apiKey") or getattr(self._api_creds, "api_key", None)
-                    api_secret = self._api_creds.get("secret") or getattr(self._api_creds, "api_secret", None)
-                    passphrase = self._api_creds.get("passphrase") or getattr(self._api_creds, "api_passphrase", None)
+                    # Log credentials for user to save (ApiCreds object, or dict on older clients)
+                    if isinstance(self._api_creds, dict):
+                        api_key = self._api_creds.get("apiKey")
+                        api_secret = self._api_creds.get("secret")
+                        passphrase = self._api_creds.get("passphrase")
+                    else:
+                        api_key = getattr(self._api_creds, "api_key", None)
+                        api_secret = getattr(self._api_creds, "api_secret", None)
+                        passphrase = getattr(self._api_creds, "api_passphrase", None)
 
                     logger.info(f"Successfully obtained API credentials!")
-                    logger.info(f"Add these to .env to avoid re-deriving:")
-                    logger.info(f"POLYMARKET_API_KEY={api_key}")
-                    logger.info(f"POLYMARKET_API_SECRET={api_secret}")
-                    logger.info(f"POLYMARKET_PASSPHRASE={passphrase}")
+                    _remember_api_creds(api_key, api_secret, passphrase)
 
                     # Set credentials on the client
                     self.client.set_api_creds(self._api_creds)
@@ -134,12 +287,35 @@ class TradeExecutor:
             return False
 
     def get_orderbook(self, token_id: str) -> Optional[Any]:
-        """Get order book for a token"""
+        """Get order book for a token (cached for ORDERBOOK_CACHE_TTL seconds)"""
+        with self._orderbook_lock:
+            cached = self._orderbook_cache.get(token_id)
+            if cached and time.monotonic() - cached[0] < ORDERBOOK_CACHE_TTL:
+                return cached[1]
+            # Another thread (e.g. batch signing) is already fetching this book - wait for it
+            inflight = self._orderbook_inflight.get(token_id)
+            if inflight is None:
+                future = self._orderbook_inflight[token_id] = Future()
+        if inflight is not None:
+            return inflight.result()
+
+        orderbook = None
+        try:
+            orderbook = self._fetch_orderbook(token_id)
+            if orderbook:
+                self._orderbook_cache[token_id] = (time.monotonic(), orderbook)
+        finally:
+            with self._orderbook_lock:
+                self._orderbook_inflight.pop(token_id, None)
+            future.set_result(orderbook)
+        return orderbook
+
+    def _fetch_orderbook(self, token_id: str) -> Optional[Any]:
         if not self._ensure_initialized():
             return None
 
         try:
-            return self.client.get_order_book(token_id)
+            return _with_backoff(lambda: self.client.get_order_book(token_id), "get_order_book")
         except Exception as e:
             logger.error(f"Failed to get orderbook: {e}")
             return None
@@ -149,32 +325,54 @@ class TradeExecutor:
         orderbook = self.get_orderbook(token_id)
         if not orderbook:
             return None
+        return self._best_price(orderbook, side)
 
+    @staticmethod
+    def _best_price(orderbook: Any, side: str) -> Optional[float]:
+        """Best ask (BUY) or best bid (SELL) from an already-fetched order book"""
         try:
             if side.upper() == "BUY":
                 # Best ask price (lowest sell)
                 asks = getattr(orderbook, 'asks', []) or []
                 if asks:
-                    # Handle both dict and object formats
-                    first_ask = asks[0]
-                    price = getattr(first_ask, 'price', None) or first_ask.get('price', 0) if isinstance(first_ask, dict) else first_ask.price
-                    return float(price)
+                    return float(_norm(asks[0]).get('price', 0))
             else:
                 # Best bid price (highest buy)
                 bids = getattr(orderbook, 'bids', []) or []
                 if bids:
-                    first_bid = bids[0]
-                    price = getattr(first_bid, 'price', None) or first_bid.get('price', 0) if isinstance(first_bid, dict) else first_bid.price
-                    return float(price)
+                    return float(_norm(bids[0]).get('price', 0))
         except Exception as e:
             logger.error(f"Error parsing orderbook: {e}")
 
         return None
 
-    def get_open_orders(self) -> list[Dict[str, Any]]:
+    def fetch_orders(self) -> Optional[list]:
+        """
+        Fetch raw orders for this wallet from the CLOB in one round trip
+
+        Pass the result to get_open_orders() / get_positions() so a caller
+        that needs both doesn't hit get_orders() twice.
+
+        Returns:
+            Raw order list, or None if the fetch failed
+        """
+        if not self._ensure_initialized():
+            logger.error("Cannot fetch orders - client not initialized")
+            return None
+
+        try:
+            return _with_backoff(self.client.get_orders, "get_orders") or []
+        except Exception as e:
+            logger.error(f"❌ Failed to fetch orders: {e}")
+            return None
+
+    def get_open_orders(self, orders: Optional[list] = None) -> list[Dict[str, Any]]:
         """
         Get all open orders for this wallet
 
+        Args:
+            orders: Raw orders from fetch_orders() (fetched here if omitted)
+
         Returns:
             List of open orders with their details
         """
@@ -188,7 +386,8 @@ class TradeExecutor:
             logger.info(f"🔍 Wallet address: {self.wallet_address}")
 
             # Try different methods to get orders
-            orders = self.client.get_orders()
+            if orders is None:
+                orders = _with_backoff(self.client.get_orders, "get_orders")
             logger.info(f"🔍 get_orders() returned: {type(orders)} with {len(orders) if orders else 0} items")
 
             # Also try to get order book trades
@@ -212,22 +411,14 @@ class TradeExecutor:
             for order in orders:
                 try:
                     # Handle both dict and object formats
-                    if isinstance(order, dict):
-                        order_id = order.get('id') or order.get('orderID')
-                        market = order.get('market', 'Unknown')
-                        asset_id = order.get('asset_id') or order.get('tokenID')
-                        price = float(order.get('price', 0))
-                        size = float(order.get('size', 0))
-                        side = order.get('side', 'BUY')
-                        status = order.get('status', 'OPEN')
-                    else:
-                        order_id = getattr(order, 'id', None) or getattr(order, 'orderID', None)
-                        market = getattr(order, 'market', 'Unknown')
-                        asset_id = getattr(order, 'asset_id', None) or getattr(order, 'tokenID', None)
-                        price = float(getattr(order, 'price', 0))
-                        size = float(getattr(order, 'size', 0))
-                        side = getattr(order, 'side', 'BUY')
-                        status = getattr(order, 'status', 'OPEN')
+                    o = _norm(order)
+                    order_id = o.get('id') or o.get('orderID')
+                    market = o.get('market', 'Unknown')
+                    asset_id = o.get('asset_id') or o.get('tokenID')
+                    price = float(o.get('price', 0))
+                    size = float(o.get('size', 0))
+                    side = o.get('side', 'BUY')
+                    status = o.get('status', 'OPEN')
 
                     formatted_orders.append({
                         'order_id': order_id,
@@ -247,16 +438,18 @@ class TradeExecutor:
 
         except Exception as e:
             logger.error(f"❌ Failed to fetch open orders: {e}")
-            import traceback
             logger.error(traceback.format_exc())
             logger.error(f"   Client type: {type(self.client)}")
             logger.error(f"   Has get_orders: {hasattr(self.client, 'get_orders')}")
             return []
 
-    def get_positions(self) -> list[Dict[str, Any]]:
+    def get_positions(self, orders: Optional[list] = None) -> list[Dict[str, Any]]:
         """
         Get current positions (filled orders / holdings)
 
+        Args:
+            orders: Raw orders from fetch_orders() (fetched here if needed and omitted)
+
         Returns:
             List of positions with market info
         """
@@ -272,62 +465,48 @@ class TradeExecutor:
                 # Some versions of py-clob-client have get_balances
                 if hasattr(self.client, 'get_balances'):
                     balances = self.client.get_balances()
-            except:
-                pass
+            except Exception as e:
+                logger.debug(f"get_balances() unavailable: {e}")
 
             if not balances:
                 # Fallback: get filled orders
                 logger.info("Fetching filled orders as positions...")
                 try:
                     # Get all orders and filter for filled/matched
-                    all_orders = self.client.get_orders()
-                    filled_orders = [
-                        o for o in all_orders
-                        if (getattr(o, 'status', None) or o.get('status') if isinstance(o, dict) else None)
-                        in ['MATCHED', 'FILLED']
-                    ]
-
-                    # Group by token to create positions
-                    positions_map = {}
-                    for order in filled_orders:
+                    all_orders = _with_backoff(self.client.get_orders, "get_orders") if orders is None else orders
+
+                    # Filter filled/matched orders and group them by token in one pass
+                    # asset_id -> [size, cost] (buy adds, sell subtracts)
+                    positions_map = defaultdict(lambda: [0.0, 0.0])
+                    for order in all_orders:
+                        o = _norm(order)
+                        if o.get('status') not in ('MATCHED', 'FILLED'):
+                            continue
                         try:
-                            if isinstance(order, dict):
-                                asset_id = order.get('asset_id') or order.get('tokenID')
-                                size = float(order.get('size', 0))
-                                price = float(order.get('price', 0))
-                                side = order.get('side', 'BUY')
-                            else:
-                                asset_id = getattr(order, 'asset_id', None) or getattr(order, 'tokenID', None)
-                                size = float(getattr(order, 'size', 0))
-                                price = float(getattr(order, 'price', 0))
-                                side = getattr(order, 'side', 'BUY')
-
-                            if asset_id not in positions_map:
-                                positions_map[asset_id] = {
-                                    'asset_id': asset_id,
-                                    'total_size': 0,
-                                    'avg_price': 0,
-                                    'total_cost': 0
-                                }
-
-                            # Add to position (buy adds, sell subtracts)
+                            asset_id = o.get('asset_id') or o.get('tokenID')
+                            size = float(o.get('size', 0))
+                            price = float(o.get('price', 0))
+                            side = o.get('side', 'BUY')
+
+                            pos = positions_map[asset_id]
                             if side == 'BUY':
-                                positions_map[asset_id]['total_size'] += size
-                                positions_map[asset_id]['total_cost'] += size * price
+                                pos[0] += size
+                                pos[1] += size * price
                             else:
-                                positions_map[asset_id]['total_size'] -= size
-                                positions_map[asset_id]['total_cost'] -= size * price
-                        except:
+                                pos[0] -= size
+                                pos[1] -= size * price
+                        except (TypeError, ValueError) as e:
+                            logger.debug(f"Skipping malformed order: {e}")
                             continue
 
                     # Calculate avg prices and format
                     balances = []
-                    for asset_id, pos in positions_map.items():
-                        if pos['total_size'] > 0.001:  # Only include non-zero positions
+                    for asset_id, (total_size, total_cost) in positions_map.items():
+                        if total_size > 0.001:  # Only include non-zero positions
                             balances.append({
                                 'asset_id': asset_id,
-                                'balance': pos['total_size'],
-                                'avg_price': pos['total_cost'] / pos['total_size'] if pos['total_size'] > 0 else 0
+                                'balance': total_size,
+                                'avg_price': total_cost / total_size
                             })
 
                 except Exception as e:
@@ -337,14 +516,10 @@ class TradeExecutor:
             formatted_positions = []
             for bal in balances:
                 try:
-                    if isinstance(bal, dict):
-                        asset_id = bal.get('asset_id') or bal.get('tokenID')
-                        balance = float(bal.get('balance', 0))
-                        avg_price = float(bal.get('avg_price', 0))
-                    else:
-                        asset_id = getattr(bal, 'asset_id', None) or getattr(bal, 'tokenID', None)
-                        balance = float(getattr(bal, 'balance', 0))
-                        avg_price = float(getattr(bal, 'avg_price', 0))
+                    b = _norm(bal)
+                    asset_id = b.get('asset_id') or b.get('tokenID')
+                    balance = float(b.get('balance', 0))
+                    avg_price = float(b.get('avg_price', 0))
 
                     if balance > 0.001:  # Only show non-zero positions
                         formatted_positions.append({
@@ -362,7 +537,6 @@ class TradeExecutor:
 
         except Exception as e:
             logger.error(f"Failed to fetch positions: {e}")
-            import traceback
             logger.error(traceback.format_exc())
             return []
 
@@ -411,52 +585,38 @@ class TradeExecutor:
             return None
 
         try:
-            from py_clob_client.order_builder.constants import BUY, SELL
-            from py_clob_client.clob_types import OrderArgs
+            order_args = self._build_order_args(token_id, side, amount_usdc, price)
+            if order_args is None:
+                return None
+            price, size = order_args.price, order_args.size
 
-            # Enforce safety limits
-            if amount_usdc > MAX_BET_SIZE:
-                logger.warning(f"Reducing bet from ${amount_usdc} to ${MAX_BET_SIZE}")
-                amount_usdc = MAX_BET_SIZE
-
-            # Get current price if not specified
-            if price is None:
-                price = self.get_best_price(token_id, side)
-                if price is None:
-                    logger.error(f"Could not determine price for token {token_id[:20]}...")
-                    return None
-                logger.info(f"Best price: {price}")
-
-            # Calculate size in shares
-            size = amount_usdc / price
-            logger.info(f"Order details: price={price}, size={size:.4f} shares")
-
-            order_side = BUY if side.upper() == "BUY" else SELL
-
-            # Create and sign order using OrderArgs (required by py-clob-client)
-            order_args = OrderArgs(
-                token_id=token_id,
-                price=price,
-                size=size,
-                side=order_side,
-            )
+            # Sign once (create_order resolves tick_size / neg_risk for proper price rounding);
+            # any retry re-posts this exact order - same salt and hash - never a freshly signed copy
+            order = self.client.create_order(order_args)
 
             logger.info(f"Submitting order to CLOB...")
-            # Submit order with tick_size for proper price rounding
-            # Most Polymarket markets use 0.01 tick_size and are not neg_risk
-            signed_order = self.client.create_and_post_order(order_args)
+            signed_order = _with_backoff(
+                lambda: self.client.post_order(order),
+                "post_order",
+                idempotent=False
+            )
             logger.info(f"CLOB response: {signed_order}")
+            # Our order may have moved top-of-book - don't price the next one off the old snapshot
+            self._orderbook_cache.pop(token_id, None)
 
             if signed_order:
                 order_id = signed_order.get("orderID") or signed_order.get("order_id") or signed_order.get("id")
                 status = signed_order.get("status", "UNKNOWN")
 
-                logger.info(f"✓ Order submitted to CLOB: {order_id}")
-                logger.info(f"  Initial status: {status}")
-                logger.info(f"  Token: {token_id[:30]}...")
-                logger.info(f"  Price: {price:.3f} | Size: {size:.2f} shares | Value: ${amount_usdc:.2f}")
-                logger.info(f"  ⚠️  Note: Order is now in orderbook waiting to fill")
-                logger.info(f"  Check https://polymarket.com for order status")
+                # One record per order (a single pass through the handlers)
+                logger.info(
+                    f"✓ Order submitted to CLOB: {order_id}\n"
+                    f"  Initial status: {status}\n"
+                    f"  Token: {token_id[:30]}...\n"
+                    f"  Price: {price:.3f} | Size: {size:.2f} shares | Value: ${price * size:.2f}\n"
+                    f"  ⚠️  Note: Order is now in orderbook waiting to fill\n"
+                    f"  Check https://polymarket.com for order status"
+                )
 
                 return order_id
 
@@ -466,7 +626,6 @@ class TradeExecutor:
         except Exception as e:
             error_msg = str(e)
             logger.error(f"Order execution failed: {type(e).__name__}: {error_msg}")
-            import traceback
             logger.error(traceback.format_exc())
 
             # Provide helpful error messages
@@ -492,7 +651,7 @@ class TradeExecutor:
             elif "signature" in error_msg.lower():
                 logger.error("❌ SIGNATURE ERROR:")
                 logger.error(f"   Signature type mismatch (proxy wallet issue)")
-                logger.error(f"   Current setup: signature_type={2 if self.wallet_address != self.signer_address else 0}")
+                logger.error(f"   Current setup: signature_type={self.sig_type}")
                 logger.error(f"   Signer: {self.signer_address[:10]}...")
                 logger.error(f"   Funder: {self.wallet_address[:10]}...")
             else:
@@ -502,6 +661,125 @@ class TradeExecutor:
 
             return None
 
+    def _build_order_args(
+        self,
+        token_id: str,
+        side: str,
+        amount_usdc: float,
+        price: Optional[float] = None
+    ) -> Optional[OrderArgs]:
+        """Clamp the amount, price it off the order book if needed and size it in shares"""
+        # Enforce safety limits
+        if amount_usdc > MAX_BET_SIZE:
+            logger.warning(f"Reducing bet from ${amount_usdc} to ${MAX_BET_SIZE}")
+            amount_usdc = MAX_BET_SIZE
+
+        # Get current price if not specified
+        if price is None:
+            # One (possibly cached) orderbook fetch, price derived locally
+            orderbook = self.get_orderbook(token_id)
+            price = self._best_price(orderbook, side) if orderbook else None
+            if price is None:
+                logger.error(f"Could not determine price for token {token_id[:20]}...")
+                return None
+            logger.info(f"Best price: {price}")
+
+        # Snap to the market's tick so create_order doesn't reject the price. The client
+        # caches tick size per token (seeded by the order book fetch above), as it does neg_risk.
+        tick = float(self.client.get_tick_size(token_id))
+        price = round(min(max(round(price / tick) * tick, tick), 1 - tick), 4)
+
+        # Calculate size in shares
+        size = amount_usdc / price
+        logger.info(f"Order details: price={price}, size={size:.4f} shares")
+
+        # OrderArgs is required by py-clob-client
+        return OrderArgs(
+            token_id=token_id,
+            price=price,
+            size=size,
+            side=_SIDE_MAP.get(side.upper(), SELL),
+        )
+
+    def place_market_orders(self, orders: List[Tuple[str, str, float]]) -> List[Optional[str]]:
+        """
+        Place several market orders, posted to the CLOB in a single request
+
+        Args:
+            orders: (token_id, side, amount_usdc) per order
+
+        Returns:
+            Order ID per input order (None where that order failed)
+        """
+        order_ids: List[Optional[str]] = [None] * len(orders)
+        if not orders:
+            return order_ids
+
+        if not self._ensure_initialized():
+            logger.error("❌ Failed to initialize CLOB client")
+            return order_ids
+
+        def build_and_sign(token_id: str, side: str, amount_usdc: float):
+            if not token_id or len(token_id) < 10 or amount_usdc <= 0:
+                logger.error(f"❌ Invalid order: token={token_id}, amount=${amount_usdc}")
+                return None
+            try:
+                order_args = self._build_order_args(token_id, side, amount_usdc)
+                # create_order does the tick-size/neg-risk lookups and EIP-712 signing
+                return self.client.create_order(order_args) if order_args is not None else None
+            except Exception as e:
+                logger.error(f"Failed to sign order for token {token_id[:20]}...: {e}")
+                return None
+
+        # Price and sign the orders in parallel - one bad order doesn't sink the batch
+        with ThreadPoolExecutor(max_workers=min(len(orders), SIGNING_WORKERS)) as pool:
+            signed_orders = list(pool.map(lambda order: build_and_sign(*order), orders))
+        pending = [  # (index, token_id, signed order)
+            (i, orders[i][0], signed) for i, signed in enumerate(signed_orders) if signed is not None
+        ]
+
+        if not pending:
+            return order_ids
+
+        logger.info(f"Submitting {len(pending)} orders to CLOB...")
+        try:
+            if PostOrdersArgs is not None and hasattr(self.client, "post_orders"):
+                responses = _with_backoff(
+                    lambda: self.client.post_orders(
+                        [PostOrdersArgs(order=signed) for _, _, signed in pending]
+                    ),
+                    "post_orders",
+                    idempotent=False
+                )
+            else:
+                responses = [self._post_one(signed) for _, _, signed in pending]
+        except Exception as e:
+            logger.error(f"Order submission failed: {type(e).__name__}: {e}")
+            return order_ids
+        finally:
+            # Our orders may have moved top-of-book
+            for _, token_id, _ in pending:
+                self._orderbook_cache.pop(token_id, None)
+
+        logger.info(f"CLOB response: {responses}")
+        for (i, token_id, _), response in zip(pending, responses or []):
+            result = response if isinstance(response, dict) else {}
+            order_id = result.get("orderID") or result.get("order_id") or result.get("id")
+            if order_id and result.get("success", True):
+                order_ids[i] = order_id
+                logger.info(f"✓ Order submitted to CLOB: {order_id} (token {token_id[:20]}...)")
+            else:
+                logger.error(f"❌ Order rejected for token {token_id[:20]}...: {result.get('errorMsg') or response}")
+
+        return order_ids
+
+    def _post_one(self, signed_order) -> Dict[str, Any]:
+        """Post one signed order; a failure becomes an error response so the rest still post"""
+        try:
+            return _with_backoff(lambda: self.client.post_order(signed_order), "post_order", idempotent=False)
+        except Exception as e:
+            return {"success": False, "errorMsg": f"{type(e).__name__}: {e}"}
+
     def validate_trade_signal(
         self,
         action: str,
@@ -515,7 +793,7 @@ class TradeExecutor:
         Returns:
             (should_trade, reason)
         """
-        if action not in ("BET YES", "BET NO"):
+        if action not in _TRADE_ACTIONS:
             return False, f"Action is {action} - no trade"
 
         if confidence < MIN_CONFIDENCE:
@@ -550,16 +828,15 @@ class TradeExecutor:
         # For prediction markets with 50% implied odds:
         # Simplified Kelly: bet_fraction = edge * (confidence / 10)
 
-        kelly_fraction = abs(edge) * (confidence / 10) * 0.5  # Half-Kelly for safety
-
-        # Position size
-        size = bankroll * kelly_fraction
+        # Half-Kelly for safety: abs(edge) * (confidence / 10) * 0.5,
+        # worked in whole cents (x100) so the stake never rounds up
+        size_cents = int(bankroll * abs(edge) * confidence * 5)
 
         # Apply limits
-        size = min(size, MAX_BET_SIZE)
-        size = max(size, 1.0)  # Minimum $1
+        size_cents = min(size_cents, int(MAX_BET_SIZE * 100))
+        size_cents = max(size_cents, 100)  # Minimum $1
 
-        return round(size, 2)
+        return size_cents / 100
 
     def execute_signal(
         self,
@@ -584,11 +861,12 @@ class TradeExecutor:
         Returns:
             Trade result or None
         """
-        logger.info(f"🎯 execute_signal called: action={action}, conf={confidence}, consensus={consensus}, bankroll=${bankroll:.2f}")
-
         # Validate signal
         should_trade, reason = self.validate_trade_signal(action, edge, confidence, consensus)
-        logger.info(f"🎯 Validation result: should_trade={should_trade}, reason={reason}")
+        logger.info(
+            f"🎯 execute_signal: action={action}, conf={confidence}, consensus={consensus}, "
+            f"bankroll=${bankroll:.2f} -> should_trade={should_trade}, reason={reason}"
+        )
 
         if not should_trade:
             logger.info(f"Skipping trade: {reason}")
@@ -596,7 +874,6 @@ class TradeExecutor:
 
         # Calculate position size
         size = self.calculate_position_size(edge, confidence, bankroll)
-        logger.info(f"🎯 Calculated position size: ${size:.2f}")
 
         # Determine side
         side = "BUY"  # We always buy (YES or NO tokens)
@@ -605,7 +882,56 @@ class TradeExecutor:
 
         # Place order
         order_id = self.place_market_order(token_id, side, size)
+        return self._signal_result(order_id, action, size, edge, confidence)
 
+    def execute_signals(
+        self,
+        signals: List[Dict[str, Any]],
+        bankroll: float = 100.0
+    ) -> List[Dict]:
+        """
+        Execute several AI signals, posting all resulting orders in one batch
+
+        Args:
+            signals: Dicts with token_id, action, edge, confidence, consensus
+                     (same meaning as the execute_signal arguments)
+            bankroll: Available capital
+
+        Returns:
+            Trade result per signal, in the same shape as execute_signal
+        """
+        results: List[Dict] = [None] * len(signals)
+        to_place = []  # (index, size)
+        for i, sig in enumerate(signals):
+            should_trade, reason = self.validate_trade_signal(
+                sig["action"], sig["edge"], sig["confidence"], sig["consensus"]
+            )
+            if not should_trade:
+                logger.info(f"Skipping trade: {reason}")
+                results[i] = {"status": "skipped", "reason": reason}
+                continue
+            size = self.calculate_position_size(sig["edge"], sig["confidence"], bankroll)
+            logger.info(f"🎯 Executing: {sig['action']} ${size:.2f} (edge: {sig['edge']*100:.1f}%, conf: {sig['confidence']}/10)")
+            to_place.append((i, size))
+
+        # We always buy (YES or NO tokens)
+        order_ids = self.place_market_orders(
+            [(signals[i]["token_id"], "BUY", size) for i, size in to_place]
+        )
+        for (i, size), order_id in zip(to_place, order_ids):
+            sig = signals[i]
+            results[i] = self._signal_result(order_id, sig["action"], size, sig["edge"], sig["confidence"])
+
+        return results
+
+    @staticmethod
+    def _signal_result(
+        order_id: Optional[str],
+        action: str,
+        size: float,
+        edge: float,
+        confidence: float
+    ) -> Dict:
         if order_id:
             return {
                 "status": "submitted",  # Changed from "success" to be more accurate
@@ -616,11 +942,10 @@ class TradeExecutor:
                 "confidence": confidence,
                 "message": "Order submitted to orderbook (waiting to fill)"
             }
-        else:
-            return {
-                "status": "failed",
-                "reason": "Order placement failed - check logs for details"
-            }
+        return {
+            "status": "failed",
+            "reason": "Order placement failed - check logs for details"
+        }
 
 
 def get_executor() -> Optional[TradeExecutor]:
@@ -4,18 +4,45 @@ Handles Polygon wallet operations for Polymarket trading
 """
 import os
 import json
-from typing import Tuple, Optional, Dict, Any
+import time
+from typing import Callable, Tuple, Optional, Dict, Any, TypeVar
+import requests
 from dotenv import load_dotenv
 from web3 import Web3
+from web3.exceptions import ProviderConnectionError, TimeExhausted
 from eth_account import Account
 
+from ..utils.http_session import get_session
+
 load_dotenv()
 
-# Contract addresses
+# Contract addresses (checksummed once at import so web3 accepts them as-is)
 # USDC.e (bridged) on Polygon - used for balance display
-USDC_CONTRACT = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
-POLYMARKET_EXCHANGE = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
-RPC_URL = "https://polygon-rpc.com"
+USDC_CONTRACT = Web3.to_checksum_address("0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174")
+POLYMARKET_EXCHANGE = Web3.to_checksum_address("0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E")
+# Polygon RPC endpoints, tried in order until one answers (override with POLYGON_RPC_URLS, comma-separated)
+DEFAULT_RPC_URLS = "https://polygon-rpc.com,https://polygon-bor-rpc.publicnode.com"
+RPC_URLS = [
+    url.strip()
+    for url in (os.getenv("POLYGON_RPC_URLS") or DEFAULT_RPC_URLS).split(",")
+    if url.strip()
+]
+RPC_TIMEOUT = 10  # seconds
+# Transport failures that mean "this endpoint is down", as opposed to a rejected call
+RPC_ERRORS = (requests.RequestException, ProviderConnectionError)
+
+# Raw on-chain units -> human units (MATIC has 18 decimals, USDC.e has 6)
+WEI_PER_MATIC = 10**18
+USDC_SCALE = 10**6
+# Multicall3 (same address on every EVM chain) - batches reads into one eth_call
+MULTICALL3_CONTRACT = Web3.to_checksum_address("0xcA11bde05977b3631167028862bE2a173976CA11")
+
+# Approval receipt polling - Polygon makes a block every ~2s, so polling faster only burns RPC calls
+RECEIPT_TIMEOUT = 120  # seconds
+RECEIPT_POLL_INTERVAL = 1.0  # seconds
+
+# Balance/allowance reads are reused for this long, so bursts of status checks share one RPC
+BALANCE_CACHE_TTL = 5  # seconds
 
 # USDC ABI for basic operations
 USDC_ABI = json.loads('''[
@@ -48,6 +75,46 @@ USDC_ABI = json.loads('''[
     }
 ]''')
 
+# Multicall3 ABI - only the functions we use
+MULTICALL3_ABI = json.loads('''[
+    {
+        "inputs": [
+            {"name": "requireSuccess", "type": "bool"},
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "tryAggregate",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]''')
+
+
+T = TypeVar("T")
+
 
 class PolygonWallet:
     """Manages Polygon wallet for Polymarket trading"""
@@ -73,47 +140,176 @@ class PolygonWallet:
         self.signer_address = self.account.address
 
         # Use proxy wallet for balance display if set, otherwise use signer
-        self.address = os.getenv("POLYMARKET_PROXY_WALLET", self.signer_address)
+        # (checksummed here - web3 rejects lowercase addresses in calldata)
+        self.address = Web3.to_checksum_address(
+            os.getenv("POLYMARKET_PROXY_WALLET") or self.signer_address
+        )
 
-        # Initialize Web3
-        self.w3 = Web3(Web3.HTTPProvider(RPC_URL))
+        # Initialize Web3 and the contracts on the first reachable endpoint
+        self._use_endpoint(0)
 
-        if not self.w3.is_connected():
-            raise ConnectionError("Failed to connect to Polygon network")
+        # The read calls never change for this wallet - ABI-encode their calldata once
+        self._balance_of_call = {
+            "to": USDC_CONTRACT,
+            "data": self.usdc.encode_abi("balanceOf", args=[self.address])
+        }
+        self._allowance_call = {
+            "to": USDC_CONTRACT,
+            "data": self.usdc.encode_abi("allowance", args=[self.address, POLYMARKET_EXCHANGE])
+        }
+        self._status_calls = [
+            (MULTICALL3_CONTRACT, self.multicall.encode_abi("getEthBalance", args=[self.address])),
+            (USDC_CONTRACT, self._balance_of_call["data"]),
+            (USDC_CONTRACT, self._allowance_call["data"]),
+        ]
+        self._status_cache = None  # (monotonic fetch time, status bundle)
+
+    @staticmethod
+    def _connect(start: int = 0) -> Tuple[Web3, int]:
+        """
+        Connect to the first responding RPC_URLS endpoint, trying them in order from start
 
-        # Initialize USDC contract
+        Only endpoints with a fallback behind them are probed; the last one
+        is used as-is and fails on its first real read instead, which
+        saves the handshake round trip when a single endpoint is configured.
+
+        Returns:
+            (Web3 instance, index of its endpoint in RPC_URLS)
+        """
+        if not RPC_URLS:
+            raise ConnectionError("No Polygon RPC endpoint configured")
+
+        for attempt in range(len(RPC_URLS)):
+            index = (start + attempt) % len(RPC_URLS)
+            url = RPC_URLS[index]
+            # JSON-RPC goes through the shared pooled Session (keep-alive across calls)
+            w3 = Web3(Web3.HTTPProvider(
+                url,
+                session=get_session(),
+                request_kwargs={"timeout": RPC_TIMEOUT}
+            ))
+            if attempt == len(RPC_URLS) - 1 or w3.is_connected():
+                return w3, index
+            print(f"Polygon RPC {url} unreachable, trying next endpoint")
+
+    def _use_endpoint(self, start: int) -> None:
+        """(Re)bind Web3 and the contracts to the first reachable endpoint from start"""
+        self.w3, self._rpc_index = self._connect(start)
         self.usdc = self.w3.eth.contract(
             address=USDC_CONTRACT,
             abi=USDC_ABI
         )
+        self.multicall = self.w3.eth.contract(
+            address=MULTICALL3_CONTRACT,
+            abi=MULTICALL3_ABI
+        )
 
-    def get_balances(self) -> Dict[str, float]:
-        """Get MATIC and USDC balances"""
-        # MATIC balance
-        matic_wei = self.w3.eth.get_balance(self.address)
-        matic = matic_wei / 10**18
-
-        # USDC balance
-        usdc_raw = self.usdc.functions.balanceOf(self.address).call()
-        usdc = usdc_raw / 10**6
+    def _with_failover(self, read: Callable[[], T]) -> T:
+        """Run a read; if the endpoint is down, move to the next RPC_URLS entry and retry once"""
+        try:
+            return read()
+        except RPC_ERRORS as e:
+            if len(RPC_URLS) < 2:
+                raise
+            print(f"Polygon RPC {RPC_URLS[self._rpc_index]} failed ({type(e).__name__}), failing over")
+            self._use_endpoint(self._rpc_index + 1)
+            return read()
 
+    def get_balances(self) -> Dict[str, float]:
+        """Get MATIC and USDC balances (one Multicall3 round trip)"""
+        status = self.get_status_bundle()
         return {
-            "matic": matic,
-            "usdc": usdc
+            "matic": status["matic"],
+            "usdc": status["usdc"]
         }
 
+    def _cached_status(self) -> Optional[Dict[str, float]]:
+        """Last status bundle if it is younger than BALANCE_CACHE_TTL"""
+        cached = self._status_cache
+        if cached and time.monotonic() - cached[0] < BALANCE_CACHE_TTL:
+            return cached[1]
+        return None
+
     def get_usdc_balance(self) -> float:
         """Get USDC balance in human-readable format"""
-        raw = self.usdc.functions.balanceOf(self.address).call()
-        return raw / 10**6
+        cached = self._cached_status()
+        if cached:
+            return cached["usdc"]
+        return self._with_failover(lambda: self._read_usdc(self._balance_of_call))
 
     def get_allowance(self) -> float:
         """Get current Polymarket allowance"""
-        raw = self.usdc.functions.allowance(
-            self.address,
-            POLYMARKET_EXCHANGE
-        ).call()
-        return raw / 10**6
+        cached = self._cached_status()
+        if cached:
+            return cached["allowance"]
+        return self._with_failover(lambda: self._read_usdc(self._allowance_call))
+
+    def _read_usdc(self, call: Dict[str, str]) -> float:
+        """eth_call a pre-encoded USDC read and scale the uint256 result"""
+        raw = self.w3.eth.call(call)
+        return int.from_bytes(raw, "big") / USDC_SCALE
+
+    def get_status_bundle(self) -> Dict[str, float]:
+        """
+        Get MATIC balance, USDC balance and Polymarket allowance in one RPC call
+
+        Batches the three reads through Multicall3; falls back to
+        individual calls if the multicall fails. Results are reused for
+        BALANCE_CACHE_TTL seconds.
+
+        Returns:
+            Dict with matic, usdc, allowance
+        """
+        cached = self._cached_status()
+        if cached:
+            return dict(cached)
+
+        status = self._with_failover(self._fetch_status)
+        self._status_cache = (time.monotonic(), status)
+        return dict(status)
+
+    def _fetch_status(self) -> Dict[str, float]:
+        """Read the status bundle from the chain, bypassing the cache"""
+        try:
+            results = self.multicall.functions.tryAggregate(True, self._status_calls).call()
+            matic_wei, usdc_raw, allowance_raw = (
+                self.w3.codec.decode(["uint256"], return_data)[0]
+                for _, return_data in results
+            )
+            return {
+                "matic": matic_wei / WEI_PER_MATIC,
+                "usdc": usdc_raw / USDC_SCALE,
+                "allowance": allowance_raw / USDC_SCALE
+            }
+        except RPC_ERRORS:
+            raise  # Endpoint down - the other read paths would fail the same way
+        except Exception as e:
+            print(f"Multicall failed, falling back to a JSON-RPC batch: {e}")
+            return self._get_status_batched()
+
+    def _get_status_batched(self) -> Dict[str, float]:
+        """The same three reads as one JSON-RPC batch POST (individual calls if unsupported)"""
+        try:
+            with self.w3.batch_requests() as batch:
+                batch.add(self.w3.eth.get_balance(self.address))
+                batch.add(self.w3.eth.call(self._balance_of_call))
+                batch.add(self.w3.eth.call(self._allowance_call))
+                matic_wei, usdc_raw, allowance_raw = batch.execute()
+        except RPC_ERRORS:
+            raise
+        except Exception as e:
+            print(f"Batch request failed, falling back to individual calls: {e}")
+            return {
+                "matic": self.w3.eth.get_balance(self.address) / WEI_PER_MATIC,
+                "usdc": self._read_usdc(self._balance_of_call),
+                "allowance": self._read_usdc(self._allowance_call)
+            }
+
+        return {
+            "matic": matic_wei / WEI_PER_MATIC,
+            "usdc": int.from_bytes(usdc_raw, "big") / USDC_SCALE,
+            "allowance": int.from_bytes(allowance_raw, "big") / USDC_SCALE
+        }
 
     def check_approval(self, min_amount: float = 1.0) -> bool:
         """Check if Polymarket has sufficient USDC approval"""
@@ -130,15 +326,29 @@ class PolygonWallet:
         Returns:
             Transaction hash or None if failed
         """
+        # The allowance is about to change - don't serve it from the cache
+        self._status_cache = None
+
         # Amount in smallest units (max if not specified)
         if amount is None:
             approve_amount = 2**256 - 1  # Max uint256
         else:
-            approve_amount = int(amount * 10**6)
+            approve_amount = int(amount * USDC_SCALE)
 
         try:
-            # Get current gas price and add 20%
-            gas_price = self.w3.eth.gas_price
+            # Gas price and nonce are independent - fetch them in one JSON-RPC batch
+            # (nonce counts pending txs, so a resend doesn't collide with one still in the mempool)
+            try:
+                with self.w3.batch_requests() as batch:
+                    batch.add(self.w3.eth.gas_price)
+                    batch.add(self.w3.eth.get_transaction_count(self.signer_address, "pending"))
+                    gas_price, nonce = batch.execute()
+            except Exception as e:
+                print(f"Batch request failed, falling back to individual calls: {e}")
+                gas_price = self.w3.eth.gas_price
+                nonce = self.w3.eth.get_transaction_count(self.signer_address, "pending")
+
+            # Add 20% to the current gas price
             gas_price = int(gas_price * 1.2)  # 20% buffer
 
             # Build transaction (use signer address for transactions)
@@ -149,7 +359,7 @@ class PolygonWallet:
                 'from': self.signer_address,
                 'gas': 100000,
                 'gasPrice': gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.signer_address),
+                'nonce': nonce,
             })
 
             # Sign and send
@@ -159,7 +369,15 @@ class PolygonWallet:
             tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
 
             # Wait for confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            try:
+                receipt = self.w3.eth.wait_for_transaction_receipt(
+                    tx_hash,
+                    timeout=RECEIPT_TIMEOUT,
+                    poll_latency=RECEIPT_POLL_INTERVAL
+                )
+            except TimeExhausted:
+                print(f"Approval {tx_hash.hex()} not mined after {RECEIPT_TIMEOUT}s - check it on Polygonscan")
+                return None
 
             if receipt['status'] == 1:
                 return tx_hash.hex()
@@ -171,22 +389,29 @@ class PolygonWallet:
 
     def print_status(self) -> None:
         """Print wallet status"""
-        balances = self.get_balances()
-        allowance = self.get_allowance()
+        status = self.get_status_bundle()
 
         print(f"Wallet: {self.address}")
-        print(f"MATIC:  {balances['matic']:.4f}")
-        print(f"USDC:   {balances['usdc']:.2f}")
-        print(f"Polymarket Allowance: {allowance:.2f} USDC")
+        print(f"MATIC:  {status['matic']:.4f}")
+        print(f"USDC:   {status['usdc']:.2f}")
+        print(f"Polymarket Allowance: {status['allowance']:.2f} USDC")
+
+
+# Global instance
+_wallet = None
 
 
 def get_wallet() -> Optional[PolygonWallet]:
-    """Get wallet instance if configured"""
-    try:
-        return PolygonWallet()
-    except Exception as e:
-        print(f"Failed to initialize wallet: {e}")
-        return None
+    """Get the shared wallet instance if configured"""
+    global _wallet
+
+    if _wallet is None:
+        try:
+            _wallet = PolygonWallet()
+        except Exception as e:
+            print(f"Failed to initialize wallet: {e}")
+            return None
+    return _wallet
 
 
 # CLI usage
@@ -1,4 +1,6 @@
 """Utility modules"""
 from .kelly import KellyCriterion, calculate_bet
+from .http_session import get_session
+from .disk_cache import cache_get, cache_get_entry, cache_set
 
-__all__ = ["KellyCriterion", "calculate_bet"]
+__all__ = ["KellyCriterion", "calculate_bet", "get_session", "cache_get", "cache_get_entry", "cache_set"]
@@ -0,0 +1,74 @@
+"""
+On-disk JSON Cache
+Short-lived cache for API responses so repeated CLI runs skip the network
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.getenv(
+    "POLYMARKET_CACHE_DIR",
+    Path.home() / ".cache" / "polymarket-agent"
+))
+
+
+def _cache_path(key: str) -> Path:
+    """Map a cache key to its file (keys are hashed - they may contain URLs)"""
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def cache_get_entry(key: str) -> Optional[Tuple[Any, float]]:
+    """
+    Read a cached value together with its age
+
+    Returns:
+        (value, age_seconds), or None if missing/unreadable
+    """
+    try:
+        with open(_cache_path(key), "r") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry.get("body"), time.time() - entry.get("ts", 0)
+
+
+def cache_get(key: str, ttl_seconds: Optional[float] = None) -> Optional[Any]:
+    """
+    Read a cached value
+
+    Args:
+        key: Cache key
+        ttl_seconds: Max age to accept (None = any age, e.g. stale-if-error fallback)
+
+    Returns:
+        Cached value, or None if missing/expired/unreadable
+    """
+    entry = cache_get_entry(key)
+    if entry is None:
+        return None
+
+    value, age = entry
+    if ttl_seconds is not None and age >= ttl_seconds:
+        return None
+    return value
+
+
+def cache_set(key: str, value: Any) -> None:
+    """Write a value to the cache (failures are logged, never raised)"""
+    path = _cache_path(key)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"ts": time.time(), "body": value}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Failed to write cache entry {path.name}: {e}")
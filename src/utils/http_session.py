@@ -0,0 +1,55 @@
+"""
+Shared HTTP Session
+Process-wide requests.Session so REST calls reuse pooled keep-alive connections
+"""
+import atexit
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Connection pool sizing - Flask threads + agent thread share one pool per host
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 32
+
+# Retry transient upstream failures (rate limits, gateway errors)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Create a Session with a pooled, retrying adapter on http and https"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),  # Never replay POSTs
+            raise_on_status=False,  # Hand the final response back to the caller
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the shared requests.Session, creating it on first use"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+                atexit.register(_session.close)
+    return _session